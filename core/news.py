@@ -2,14 +2,27 @@
 """
 Helldivers 2 快讯核心业务模块
 """
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
 import sys
 import os
 import aiohttp
 import asyncio
+import httpx
+import functools
+import heapq
+import operator
 import re
+import orjson as json
 from datetime import datetime, timezone
 
+try:
+    # 可选依赖 google-re2：线性时间匹配，畸形输入下不会回溯爆炸
+    import re2 as _markup_re
+except ImportError:
+    _markup_re = re
+
 # 确保正确的路径设置
 current_dir = os.path.dirname(__file__)
 project_root = os.path.dirname(current_dir)
@@ -21,14 +34,114 @@ if project_root not in sys.path:
 from utils.logger import bot_logger
 from utils.translation_cache import translation_cache
 from utils.translation_retry_queue import translation_retry_queue
-from utils.api_retry import APIRetryMixin
+from utils.api_retry import APIRetryMixin, APIStatusError, parse_retry_after
 from utils.config import settings
 from utils.hd2_cache import hd2_cache_service
+from utils.http_client import get_http_session, get_translation_client
+from utils.rate_limiter import AsyncLimiter
+
+# 游戏内占位符与BBCode标签合并为一次扫描，按命中的分组决定替换内容（可用时由RE2编译）
+_TAG_RE = _markup_re.compile(
+    r'(?P<space><i=\d+>|</i>)'                       # 游戏内 <i=x></i> 占位符
+    r'|(?P<newline>\[/?p\]|\[/?h[1-6]\]|\[/?list\])'   # 段落、标题、列表标签
+    r'|(?P<bullet>\[\*\])'                             # 列表项标签
+    r'|(?P<drop>\[/\*\]|\[/?[a-zA-Z][a-zA-Z0-9]*(?:=[^\]]+)?\])'  # 其余BBCode标签
+)
+_TAG_REPLACEMENTS = {'space': ' ', 'newline': '\n', 'bullet': '\n• ', 'drop': ''}
+# HTML标签（需在BBCode清理之后单独匹配，避免跨越已清理的标签）
+_HTML_TAG_RE = _markup_re.compile(r'<[^>]+>')
+# 垃圾链接和样式：zendesk链接、style属性、HTTP链接
+_JUNK_RE = re.compile(r'zendesk\.com[^\s\]]*|style="[^"]*"|https?://[^\s\]]+')
+# 依赖前序清理结果的尾部垃圾内容
+_KNOWN_ISSUES_TAIL_RE = re.compile(r'\]已知问题.*?$', re.MULTILINE)
+_HD2_IDENTIFIER_RE = re.compile(r'--HELLDIVERS-2-[^\]]*')
+# 多个连续换行（保留段落分隔）
+_MULTI_NEWLINE_RE = re.compile(r'\n\s*\n\s*\n+')
+# 多个连续空格/制表符
+_INLINE_WS_RE = re.compile(r'[ \t]+')
+
+# clean_game_text 的清理步骤，按顺序执行（后续步骤依赖前序清理结果，无法合并为单个正则）
+_MARKUP_STEPS: Tuple[Tuple[re.Pattern, Any], ...] = (
+    (_TAG_RE, lambda m: _TAG_REPLACEMENTS[m.lastgroup]),  # 占位符和BBCode标签，保留内容
+    (_HTML_TAG_RE, ''),             # HTML标签（如果有）
+    (_JUNK_RE, ''),                 # 垃圾链接和样式标签
+    (_KNOWN_ISSUES_TAIL_RE, ''),
+    (_HD2_IDENTIFIER_RE, ''),       # 特定格式的标识符
+)
+_WHITESPACE_STEPS: Tuple[Tuple[re.Pattern, Any], ...] = (
+    (_MULTI_NEWLINE_RE, '\n\n'),    # 多个连续换行合并为两个，保留段落分隔
+    (_INLINE_WS_RE, ' '),           # 多个空格合并为一个
+)
+_CLEAN_STEPS = _MARKUP_STEPS + _WHITESPACE_STEPS
+# 预筛选：文本中不含任何标记特征时只需清理空白
+_MARKUP_HINT_RE = re.compile(r'[<\[\]]|zendesk\.com|style="|https?://|--HELLDIVERS-2-')
+
+# 中文（CJK统一汉字）与拉丁字母，用于跳过无需翻译的文本
+_HAN_RE = re.compile(r'[\u4e00-\u9fff]')
+_ASCII_LETTER_RE = re.compile(r'[A-Za-z]')
+
+# 批量翻译时拼接多段文本的编号分隔符（⟦1⟧、⟦2⟧…），游戏文本中不会出现
+_BATCH_MARKER_CHARS = ('⟦', '⟧')
+_BATCH_SPLIT_RE = re.compile(r'\s*⟦(\d+)⟧\s*')
+
+# 翻译API令牌桶：稳定每秒10次请求
+_translation_limiter = AsyncLimiter(max_rate=10, time_period=1)
+
+# HD2 API 必需的请求头
+_HD2_HEADERS = {
+    'X-Super-Client': 'hd2_qqbot',
+    'X-Super-Contact': 'xiaoyueyoqwq@vaiiya.org',
+    'User-Agent': 'Helldivers2-QQBot/1.0'
+}
+
+# 快讯按发布时间排序的键（C实现，避免逐条调用lambda）
+_PUBLISHED_KEY = operator.itemgetter('published')
+
+# 快讯类型名称
+_DISPATCH_TYPE_NAMES = {
+    0: "一般快讯",
+    1: "紧急通告",
+    2: "战术更新",
+    3: "系统公告"
+}
+
+# 快讯消息固定页脚
+_DISPATCH_FOOTER = "使用/news [1-5]可以查看其他快讯！🌍"
+
+# 本地时区（进程启动时确定一次）
+_LOCAL_TZ = datetime.now().astimezone().tzinfo
+
+
+@functools.lru_cache(maxsize=256)
+def _format_time_cached(time_str: str) -> str:
+    """
+    将ISO格式的UTC时间字符串转换为本地时间显示（结果按输入缓存）
+    
+    Args:
+        time_str: ISO格式时间字符串
+        
+    Returns:
+        格式化后的时间字符串
+    """
+    try:
+        # 解析ISO时间格式
+        dt = datetime.fromisoformat(time_str.removesuffix('Z')).replace(tzinfo=timezone.utc)
+        
+        # 转换为本地时间显示
+        return dt.astimezone(_LOCAL_TZ).strftime("%Y-%m-%d %H:%M:%S")
+    except (ValueError, AttributeError):
+        return "未知时间"
+
 
+def _now_iso() -> str:
+    """返回带本地时区的当前时间（ISO格式），复用进程启动时确定的时区"""
+    return datetime.now(_LOCAL_TZ).isoformat()
 
+
+@functools.lru_cache(maxsize=1024)
 def clean_game_text(text: str) -> str:
     """
-    清理游戏文本中的格式占位符，转换为纯文本格式
+    清理游戏文本中的格式占位符，转换为纯文本格式（结果按原文缓存）
     
     支持清理的标签类型：
     - 游戏内 <i=x></i> 占位符：用于高亮显示
@@ -45,128 +158,268 @@ def clean_game_text(text: str) -> str:
         return text
     
     cleaned = text
-    
-    # 清理游戏内的 <i=x></i> 占位符
-    cleaned = re.sub(r'<i=\d+>', ' ', cleaned)
-    cleaned = re.sub(r'</i>', ' ', cleaned)
-    
-    # 清理BBCode标签 - 保留内容，移除标签
-    # 段落标签
-    cleaned = re.sub(r'\[/?p\]', '\n', cleaned)
-    # 标题标签
-    cleaned = re.sub(r'\[/?h[1-6]\]', '\n', cleaned)
-    # 粗体标签
-    cleaned = re.sub(r'\[/?b\]', '', cleaned)
-    # 斜体标签
-    cleaned = re.sub(r'\[/?i\]', '', cleaned)
-    # 下划线标签
-    cleaned = re.sub(r'\[/?u\]', '', cleaned)
-    # 列表标签
-    cleaned = re.sub(r'\[/?list\]', '\n', cleaned)
-    # 列表项标签
-    cleaned = re.sub(r'\[\*\]', '\n• ', cleaned)
-    cleaned = re.sub(r'\[/\*\]', '', cleaned)
-    # 颜色标签
-    cleaned = re.sub(r'\[color=[^\]]+\]', '', cleaned)
-    cleaned = re.sub(r'\[/color\]', '', cleaned)
-    # URL标签
-    cleaned = re.sub(r'\[url=[^\]]+\]', '', cleaned)
-    cleaned = re.sub(r'\[/url\]', '', cleaned)
-    # 其他常见BBCode标签
-    cleaned = re.sub(r'\[/?[a-zA-Z][a-zA-Z0-9]*(?:=[^\]]+)?\]', '', cleaned)
-    
-    # 清理HTML标签（如果有）
-    cleaned = re.sub(r'<[^>]+>', '', cleaned)
-    
-    # 清理垃圾链接和样式标签
-    # 移除zendesk链接和相关内容
-    cleaned = re.sub(r'zendesk\.com[^\s\]]*', '', cleaned)
-    cleaned = re.sub(r'style="[^"]*"', '', cleaned)
-    cleaned = re.sub(r'\]已知问题.*?$', '', cleaned, flags=re.MULTILINE)
-    
-    # 清理其他常见的垃圾内容
-    cleaned = re.sub(r'https?://[^\s\]]+', '', cleaned)  # 移除所有HTTP链接
-    cleaned = re.sub(r'--HELLDIVERS-2-[^\]]*', '', cleaned)  # 移除特定格式的标识符
-    
-    # 清理多余的空白字符，但保留段落分隔
-    cleaned = re.sub(r'\n\s*\n\s*\n+', '\n\n', cleaned)  # 多个连续换行合并为两个
-    cleaned = re.sub(r'[ \t]+', ' ', cleaned)  # 多个空格合并为一个
+    steps = _CLEAN_STEPS if _MARKUP_HINT_RE.search(text) else _WHITESPACE_STEPS
+    for pattern, replacement in steps:
+        cleaned = pattern.sub(replacement, cleaned)
     cleaned = cleaned.strip()
     
     return cleaned
 
 
+@dataclass(slots=True)
+class Dispatch:
+    """规范化后的快讯记录（由API原始字典一次性转换）"""
+    id: str
+    message: str
+    type: int
+    published: str
+    
+    @classmethod
+    def from_api(cls, data: Dict[str, Any], index: int = 0) -> "Dispatch":
+        """
+        从API原始数据构建快讯记录
+        
+        Args:
+            data: API返回的单条快讯字典
+            index: 缺少ID时使用的序号
+        """
+        return cls(
+            id=str(data.get('id', index)),
+            message=data.get('message') or '',
+            type=data.get('type') or 0,
+            published=data.get('published') or ''
+        )
+
+
 class TranslationService(APIRetryMixin):
     """AI智能翻译服务"""
     
     def __init__(self):
         super().__init__()
         self.api_url = settings.TRANSLATION_API_URL
-        self.timeout = aiohttp.ClientTimeout(total=settings.TRANSLATION_TIMEOUT)
+        self.timeout = settings.TRANSLATION_TIMEOUT
         self.headers = {
             "Content-Type": "application/json",
             "User-Agent": settings.HD2_API_USER_AGENT
         }
+        # 进程内翻译记忆（LRU），键为 (目标语言, 去除首尾空白的原文)
+        self._mem: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._mem_cap = 512
+        self._mem_lock = asyncio.Lock()
+        # 所有翻译服务实例共享同一个令牌桶，遵循上游API的速率限制
+        self._limiter = _translation_limiter
     
-    async def translate_text(self, text: str, to_lang: str = "zh-CN") -> Optional[str]:
+    async def _remember(self, key: Tuple[str, str], translated_text: str) -> None:
+        """将成功的翻译写入进程内LRU缓存，超出容量时淘汰最久未使用的条目"""
+        async with self._mem_lock:
+            self._mem[key] = translated_text
+            self._mem.move_to_end(key)
+            while len(self._mem) > self._mem_cap:
+                self._mem.popitem(last=False)
+    
+    @staticmethod
+    def _needs_translation(stripped: str) -> bool:
+        """快速判断文本是否需要调用翻译API（过短、已是中文或不含拉丁字母的文本无需翻译）
+
+        Args:
+            stripped: 已去除首尾空白的文本
         """
-        使用AI智能翻译文本（带重试机制）
+        if len(stripped) < 3:
+            return False
+        if not _ASCII_LETTER_RE.search(stripped):
+            return False
+        letters = sum(1 for ch in stripped if ch.isalpha())
+        if letters and len(_HAN_RE.findall(stripped)) / letters > 0.5:
+            return False
+        return True
+    
+    def _recall(self, key: Tuple[str, str]) -> Optional[str]:
+        """从进程内LRU缓存读取翻译"""
+        if key in self._mem:
+            self._mem.move_to_end(key)
+            return self._mem[key]
+        return None
+    
+    async def _request_translation(self, stripped: str, to_lang: str) -> Optional[str]:
+        """
+        调用翻译API（带重试机制）
         
         Args:
-            text: 待翻译的文本
-            to_lang: 目标语言代码，默认为中文简体(zh-CN)
+            stripped: 去除首尾空白的待翻译文本
+            to_lang: 目标语言代码
         
         Returns:
-            翻译后的文本，失败时返回原文
+            翻译后的文本；翻译结果为空或与原文相同时返回原文；失败时返回None
         """
-        if not text or not text.strip() or len(text.strip()) < 3:
-            return text
-        
         payload = {
-            "text": text.strip(),
+            "text": stripped,
             "sourceLanguage": "auto",
             "targetLanguage": to_lang
         }
         
         async def _api_call():
-            async with aiohttp.ClientSession(timeout=self.timeout) as session:
-                async with session.post(self.api_url, json=payload, headers=self.headers) as response:
-                    if response.status == 200:
-                        try:
-                            data = await response.json()
-                            if "translatedText" in data:
-                                translated_text = data["translatedText"].strip()
-                                if translated_text and translated_text != text.strip():
-                                    return translated_text
-                                else:
-                                    bot_logger.warning(f"AI翻译结果为空或与原文相同: '{text[:30]}...'")
-                                    return text  # 返回原文表示翻译无效
-                            else:
-                                error_msg = data.get('error', 'Unknown error')
-                                bot_logger.error(f"AI翻译API返回错误: {error_msg}")
-                                return None # API逻辑错误
-                        except Exception as json_error:
-                            bot_logger.error(f"解析AI翻译API响应JSON失败: {json_error}")
-                            return None # JSON解析错误
+            client = await get_translation_client()
+            await self._limiter.acquire()
+            try:
+                response = await client.post(self.api_url, json=payload, headers=self.headers, timeout=self.timeout)
+            except httpx.TimeoutException as e:
+                # 转换为 asyncio 超时，由重试机制使用超时退避策略
+                raise asyncio.TimeoutError() from e
+            if response.status_code == 200:
+                try:
+                    data = json.loads(response.content)
+                    if "translatedText" in data:
+                        translated_text = data["translatedText"].strip()
+                        if translated_text and translated_text != stripped:
+                            return translated_text
+                        else:
+                            bot_logger.warning(f"AI翻译结果为空或与原文相同: '{stripped[:30]}...'")
+                            return stripped  # 返回原文表示翻译无效
                     else:
-                        # 返回带状态码的响应对象，让重试机制处理
-                        class APIResponse:
-                            def __init__(self, status):
-                                self.status = status
-                        return APIResponse(response.status)
+                        error_msg = data.get('error', 'Unknown error')
+                        bot_logger.error(f"AI翻译API返回错误: {error_msg}")
+                        return None # API逻辑错误
+                except Exception as json_error:
+                    bot_logger.error(f"解析AI翻译API响应JSON失败: {json_error}")
+                    return None # JSON解析错误
+            else:
+                # 抛出带状态码的异常，让重试机制处理
+                raise APIStatusError(
+                    response.status_code,
+                    parse_retry_after(response.headers.get("Retry-After"))
+                )
 
         result = await self.retry_api_call(
             _api_call,
             base_delay=settings.TRANSLATION_RETRY_BASE_DELAY,
             max_delay=settings.TRANSLATION_RETRY_MAX_DELAY,
-            increment=settings.TRANSLATION_RETRY_INCREMENT
+            increment=settings.TRANSLATION_RETRY_INCREMENT,
+            backoff="exponential",
+            timeout_base_delay=0.25
         )
 
-        if result and not hasattr(result, 'status'):
-            return result
-        else:
+        return result or None
+    
+    async def translate_text(self, text: str, to_lang: str = "zh-CN") -> Optional[str]:
+        """
+        使用AI智能翻译文本（带重试机制）
+        
+        Args:
+            text: 待翻译的文本
+            to_lang: 目标语言代码，默认为中文简体(zh-CN)
+        
+        Returns:
+            翻译后的文本，失败时返回原文
+        """
+        # 长度不足时无需去除空白即可判定
+        if not text or len(text) < 3:
+            return text
+        
+        stripped = text.strip()
+        if not self._needs_translation(stripped):
+            return text
+        
+        mem_key = (to_lang, stripped)
+        remembered = self._recall(mem_key)
+        if remembered is not None:
+            return remembered
+        
+        result = await self._request_translation(stripped, to_lang)
+        if result is None:
             bot_logger.error(f"AI翻译最终失败，返回原文: '{text[:30]}...'")
             return text
+        if result == stripped:
+            return text
+        
+        await self._remember(mem_key, result)
+        return result
+    
+    @staticmethod
+    def _unsafe_for_batch(text: str) -> bool:
+        """检查文本是否包含分隔符字符，包含时不能安全地参与合并翻译"""
+        return any(char in text for char in _BATCH_MARKER_CHARS)
+    
+    @staticmethod
+    def _split_batch(translated: str, count: int) -> Optional[List[str]]:
+        """
+        按编号分隔符拆分合并翻译的译文
+        
+        Args:
+            translated: 合并翻译的译文
+            count: 期望的段数
+        
+        Returns:
+            各段译文，分隔符编号不是依次的 1..count-1 时返回 None
+        """
+        pieces = _BATCH_SPLIT_RE.split(translated)
+        # split 的结果为 [段, 编号, 段, 编号, ..., 段]
+        markers = pieces[1::2]
+        if markers != [str(n) for n in range(1, count)]:
+            return None
+        return pieces[0::2]
+    
+    async def translate_texts(self, texts: List[str], to_lang: str = "zh-CN") -> List[str]:
+        """
+        批量翻译多段文本，尽量合并为一次API请求
+        
+        使用编号分隔符拼接待翻译文本，按分隔符拆分译文；
+        若分隔符缺失、错序或段数与原文不一致，则回退为逐条翻译。
+        
+        Args:
+            texts: 待翻译的文本列表
+            to_lang: 目标语言代码，默认为中文简体(zh-CN)
+        
+        Returns:
+            与输入一一对应的翻译结果，失败的条目返回原文
+        """
+        results = list(texts)
+        # 每段文本只去除一次首尾空白，后续全部复用
+        stripped_texts = [text.strip() if text else "" for text in texts]
+        pending: List[int] = []
+        for i, stripped in enumerate(stripped_texts):
+            if not self._needs_translation(stripped):
+                continue
+            remembered = self._recall((to_lang, stripped))
+            if remembered is not None:
+                results[i] = remembered
+            else:
+                pending.append(i)
+        
+        if not pending:
+            return results
+        
+        # 单条文本或文本包含分隔符字符时，不合并翻译
+        if len(pending) == 1 or any(self._unsafe_for_batch(stripped_texts[i]) for i in pending):
+            translated = await asyncio.gather(*[self.translate_text(texts[i], to_lang) for i in pending])
+            for i, result in zip(pending, translated):
+                results[i] = result
+            return results
+        
+        joined = stripped_texts[pending[0]] + "".join(
+            f"\n⟦{n}⟧\n{stripped_texts[i]}" for n, i in enumerate(pending[1:], 1)
+        )
+        translated_joined = await self._request_translation(joined, to_lang)
+        parts = self._split_batch(translated_joined, len(pending)) if translated_joined else None
+        
+        if parts is None:
+            bot_logger.warning(f"批量翻译结果无法按分隔符拆分为 {len(pending)} 段，回退为逐条翻译")
+            translated = await asyncio.gather(*[self.translate_text(texts[i], to_lang) for i in pending])
+            for i, result in zip(pending, translated):
+                results[i] = result
+            return results
+        
+        for i, part in zip(pending, parts):
+            stripped = stripped_texts[i]
+            part = part.strip()
+            if part and part != stripped:
+                results[i] = part
+                await self._remember((to_lang, stripped), part)
+        
+        return results
+
+
+# 全局共享的翻译服务实例（各业务服务共用翻译记忆与限速器）
+translation_service = TranslationService()
 
 
 class DispatchService(APIRetryMixin):
@@ -176,48 +429,39 @@ class DispatchService(APIRetryMixin):
         super().__init__()
         self.api_url = "https://api.helldivers2.dev/api/v1/dispatches"
         self.timeout = aiohttp.ClientTimeout(total=10)
-        self.translation_service = TranslationService()
+        self.translation_service = translation_service
+        self._translate_sem = asyncio.Semaphore(3)
+        self._inflight_translations: Dict[str, asyncio.Task] = {}
         
-    async def fetch_dispatches_from_api(self) -> Optional[List[Dict[str, Any]]]:
+    async def fetch_dispatches_from_api(self, limit: int = 5) -> Optional[List[Dict[str, Any]]]:
         """
         从API获取原始快讯数据（带重试机制）
         
+        Args:
+            limit: 返回最新快讯的数量
+        
         Returns:
             快讯列表或None(如果获取失败)
         """
-        # 设置必需的headers
-        headers = {
-            'X-Super-Client': 'hd2_qqbot',
-            'X-Super-Contact': 'xiaoyueyoqwq@vaiiya.org',
-            'User-Agent': 'Helldivers2-QQBot/1.0'
-        }
-        
         async def _api_call():
-            async with aiohttp.ClientSession(timeout=self.timeout) as session:
-                bot_logger.debug(f"正在从API获取快讯数据: {self.api_url}")
-                async with session.get(self.api_url, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        bot_logger.info(f"成功从API获取快讯数据，共 {len(data)} 条")
-                        
-                        # 按发布时间排序，最新的在前
-                        sorted_data = sorted(data, key=lambda x: x.get('published', ''), reverse=True)
-                        return sorted_data
-                    else:
-                        # 返回带状态码的响应对象，让重试机制处理
-                        class APIResponse:
-                            def __init__(self, status):
-                                self.status = status
-                        return APIResponse(response.status)
-        
-        # 使用重试机制调用API
-        result = await self.retry_api_call(_api_call)
+            session = await get_http_session()
+            bot_logger.debug(f"正在从API获取快讯数据: {self.api_url}")
+            async with session.get(self.api_url, headers=_HD2_HEADERS, timeout=self.timeout) as response:
+                if response.status == 200:
+                    data = json.loads(await response.read())
+                    bot_logger.info(f"成功从API获取快讯数据，共 {len(data)} 条")
+                    
+                    # 只取发布时间最新的 limit 条，最新的在前；缺少发布时间的快讯排在最后
+                    dated = [item for item in data if item.get('published')]
+                    latest = heapq.nlargest(limit, dated, key=_PUBLISHED_KEY)
+                    if len(latest) < limit and len(dated) < len(data):
+                        latest.extend([item for item in data if not item.get('published')][:limit - len(latest)])
+                    return latest
+                # 抛出带状态码的异常，让重试机制处理
+                raise APIStatusError(response.status)
         
-        # 如果结果是APIResponse对象，说明请求失败
-        if hasattr(result, 'status'):
-            return None
-            
-        return result
+        # 使用重试机制调用API，不可重试的失败返回None
+        return await self.retry_api_call(_api_call)
     
     async def refresh_cache_if_needed(self) -> bool:
         """
@@ -236,20 +480,23 @@ class DispatchService(APIRetryMixin):
             
             # 检查是否需要刷新
             # 检查内容是否需要刷新（比较相似度），只检查前5条
-            needs_refresh = await translation_cache.check_content_freshness('dispatches', new_dispatches[:5])
+            needs_refresh = await translation_cache.check_content_freshness('dispatches', new_dispatches)
             
             if needs_refresh:
                 bot_logger.info("开始刷新快讯缓存...")
                 
-                # 只处理前5条快讯
-                dispatches_to_cache = new_dispatches[:5]
+                # 只处理前5条快讯（API结果已截取为最新5条）
+                dispatches_to_cache = new_dispatches
+                
+                # 一次性规范化为快讯记录
+                records = [Dispatch.from_api(item, i) for i, item in enumerate(dispatches_to_cache)]
                 
                 # 清理过期缓存
-                current_ids = [str(item.get('id', i)) for i, item in enumerate(dispatches_to_cache)]
+                current_ids = [record.id for record in records]
                 await translation_cache.clear_outdated_cache('dispatches', current_ids)
                 
                 # 翻译并缓存新内容
-                await self._translate_and_cache_dispatches(dispatches_to_cache)
+                await self._translate_and_cache_dispatches(records)
                 
                 # 更新内容索引
                 await translation_cache.store_content_list('dispatches', dispatches_to_cache)
@@ -268,9 +515,9 @@ class DispatchService(APIRetryMixin):
             bot_logger.error(f"刷新缓存时发生错误: {e}")
             return False
     
-    async def _translate_and_cache_dispatches(self, dispatches: List[Dict[str, Any]]) -> bool:
+    async def _translate_and_cache_dispatches(self, dispatches: List[Dispatch]) -> bool:
         """
-        翻译并缓存快讯数据
+        翻译并缓存快讯数据（所有需要翻译的快讯合并为一次批量翻译请求）
 
         Args:
             dispatches: 快讯数据列表
@@ -278,62 +525,94 @@ class DispatchService(APIRetryMixin):
         Returns:
             bool: 如果至少有一条快讯被成功翻译和缓存，则返回 True
         """
+        dispatches = [dispatch for dispatch in dispatches if dispatch.message]
+        
+        # 检查是否已有翻译缓存
+        cached_translations = await asyncio.gather(
+            *[translation_cache.get_translated_content('dispatches', dispatch.id) for dispatch in dispatches]
+        )
+        
         processed_count = 0
-        for dispatch in dispatches:
-            try:
-                item_id = str(dispatch.get('id', 0))
-                original_message = dispatch.get('message', '')
-                
-                if not original_message:
-                    continue
-                
-                # 检查是否已有翻译缓存
-                cached_translation = await translation_cache.get_translated_content('dispatches', item_id)
-                
-                # 如果没有缓存或原文发生变化，进行翻译
-                if not cached_translation or cached_translation.get('original_text') != original_message:
-                    bot_logger.info(f"翻译快讯 #{item_id}...")
-                    
-                    translated_text = await self.translation_service.translate_text(original_message, "zh")
-                    
-                    # 只有翻译成功且与原文不同时才存储缓存
-                    if translated_text and translated_text != original_message:
-                        # 存储翻译结果
-                        metadata = {
-                            'published': dispatch.get('published'),
-                            'type': dispatch.get('type'),
-                            'translation_time': datetime.now().isoformat()
-                        }
-                        
-                        await translation_cache.store_translated_content(
-                            'dispatches', item_id, original_message, translated_text, metadata
-                        )
-                        processed_count += 1
-                        bot_logger.debug(f"快讯 #{item_id} 翻译成功并已缓存")
-                    else:
-                        # 翻译失败，添加到重试队列
-                        metadata = {
-                            'published': dispatch.get('published'),
-                            'type': dispatch.get('type'),
-                            'failed_at': datetime.now().isoformat()
-                        }
-                        
-                        await translation_retry_queue.add_retry_task(
-                            'dispatches', item_id, original_message, metadata
-                        )
-                        bot_logger.info(f"快讯 #{item_id} 翻译失败，已添加到重试队列")
-                else:
-                    bot_logger.debug(f"快讯 #{item_id} 已有有效翻译缓存")
-                    processed_count += 1 # 已有缓存也视为成功处理
-                    
-                # 添加小延迟避免API调用过快
-                await asyncio.sleep(0.1)
-                
-            except Exception as e:
-                bot_logger.error(f"翻译快讯 {dispatch.get('id')} 时发生错误: {e}")
+        pending: List[Dispatch] = []
+        for dispatch, cached_translation in zip(dispatches, cached_translations):
+            # 已有缓存且原文未变化，无需重新翻译
+            if cached_translation and cached_translation.get('original_text') == dispatch.message:
+                bot_logger.debug(f"快讯 #{dispatch.id} 已有有效翻译缓存")
+                processed_count += 1 # 已有缓存也视为成功处理
+            else:
+                pending.append(dispatch)
+        
+        if not pending:
+            return processed_count > 0
+        
+        bot_logger.info(f"翻译快讯 {', '.join('#' + dispatch.id for dispatch in pending)}...")
+        
+        # 整批共用一个时间戳（仅在确实需要翻译时生成）
+        batch_ts = _now_iso()
+        
+        # 信号量限制并发翻译请求数，避免API调用过快
+        async with self._translate_sem:
+            translated_texts = await self.translation_service.translate_texts(
+                [dispatch.message for dispatch in pending], "zh"
+            )
+        
+        results = await asyncio.gather(
+            *[self._store_translation(dispatch, translated_text, batch_ts)
+              for dispatch, translated_text in zip(pending, translated_texts)],
+            return_exceptions=True
+        )
+        
+        for dispatch, result in zip(pending, results):
+            if isinstance(result, BaseException):
+                bot_logger.error(f"翻译快讯 {dispatch.id} 时发生错误: {result}")
+            elif result:
+                processed_count += 1
         
         return processed_count > 0
     
+    async def _store_translation(self, dispatch: Dispatch, translated_text: Optional[str], batch_ts: str) -> bool:
+        """
+        缓存单条快讯的翻译结果，翻译失败时加入重试队列
+
+        Args:
+            dispatch: 快讯记录
+            translated_text: 翻译结果
+            batch_ts: 本批次处理的时间戳（本地时区，ISO格式）
+        
+        Returns:
+            bool: 翻译成功并缓存时返回 True
+        """
+        item_id = dispatch.id
+        original_message = dispatch.message
+        
+        # 只有翻译成功且与原文不同时才存储缓存
+        if translated_text and translated_text != original_message:
+            # 存储翻译结果
+            metadata = {
+                'published': dispatch.published,
+                'type': dispatch.type,
+                'translation_time': batch_ts
+            }
+            
+            await translation_cache.store_translated_content(
+                'dispatches', item_id, original_message, translated_text, metadata
+            )
+            bot_logger.debug(f"快讯 #{item_id} 翻译成功并已缓存")
+            return True
+        
+        # 翻译失败，添加到重试队列
+        metadata = {
+            'published': dispatch.published,
+            'type': dispatch.type,
+            'failed_at': batch_ts
+        }
+        
+        await translation_retry_queue.add_retry_task(
+            'dispatches', item_id, original_message, metadata
+        )
+        bot_logger.info(f"快讯 #{item_id} 翻译失败，已添加到重试队列")
+        return False
+    
     async def get_dispatches(self, limit: int = 5) -> Optional[List[Dict[str, Any]]]:
         """
         获取快讯数据（严格从缓存获取），遵循Redis优先原则
@@ -375,25 +654,29 @@ class DispatchService(APIRetryMixin):
                 return ["\n📰 当前没有活跃的快讯"]
             
             messages = []
+            records = [Dispatch.from_api(raw_dispatch, index) for index, raw_dispatch in enumerate(dispatches)]
+            
+            # 并发读取所有快讯的翻译缓存
+            cached_translations = await asyncio.gather(*[
+                translation_cache.get_translated_content('dispatches', dispatch.id) for dispatch in records
+            ])
+            
+            # 渲染路径只读缓存：未命中的快讯本次显示原文，并合并为一个后台批量翻译任务
+            missing = [
+                dispatch for dispatch, cached_translation in zip(records, cached_translations)
+                if not (cached_translation and cached_translation.get('translated_text'))
+            ]
+            if missing:
+                bot_logger.info(f"{len(missing)} 条快讯没有缓存翻译，本次显示原文并在后台翻译")
+                self._schedule_background_translation(missing)
             
-            for i, dispatch in enumerate(dispatches, start_index):
+            for i, (dispatch, cached_translation) in enumerate(zip(records, cached_translations), start_index):
                 # 获取基本信息
-                dispatch_id = str(dispatch.get('id', 0))
-                published_time = self._format_time(dispatch.get('published', ''))
-                dispatch_type = self._get_dispatch_type_name(dispatch.get('type', 0))
-                original_message = dispatch.get('message', '无内容')
+                dispatch_id = dispatch.id
+                published_time = _format_time_cached(dispatch.published)
+                dispatch_type = self._get_dispatch_type_name(dispatch.type)
+                original_message = dispatch.message or '无内容'
                 
-                # 即时翻译检查
-                cached_translation = await translation_cache.get_translated_content('dispatches', dispatch_id)
-                
-                if not (cached_translation and cached_translation.get('translated_text')):
-                    bot_logger.info(f"快讯 #{dispatch_id} 没有缓存翻译，进行即时翻译和缓存...")
-                    if not await self._translate_and_cache_dispatches([dispatch]):
-                        bot_logger.warning(f"快讯 #{dispatch_id} 即时翻译失败，将显示原文。")
-                    else:
-                        bot_logger.info(f"快讯 #{dispatch_id} 即时翻译成功。")
-                        cached_translation = await translation_cache.get_translated_content('dispatches', dispatch_id)
-
                 # 使用翻译（如果存在），否则回退到原文
                 translated_message = original_message
                 if cached_translation and cached_translation.get('translated_text'):
@@ -404,16 +687,16 @@ class DispatchService(APIRetryMixin):
                 translated_message = clean_game_text(translated_message)
                 
                 # 构建单个快讯的消息
-                message = f"\n📰 快讯 {i} | HELLDIVERS 2\n"
-                message += "-------------\n"
-                message += f"▎类型: {dispatch_type}\n"
-                message += f"▎编号: #{dispatch_id}\n"
-                message += f"▎时间: {published_time}\n"
-                message += f"▎内容: {translated_message}\n"
-                message += "-------------\n"
-                message += "使用/news [1-5]可以查看其他快讯！🌍"
-                
-                messages.append(message)
+                messages.append("".join([
+                    f"\n📰 快讯 {i} | HELLDIVERS 2\n",
+                    "-------------\n",
+                    f"▎类型: {dispatch_type}\n",
+                    f"▎编号: #{dispatch_id}\n",
+                    f"▎时间: {published_time}\n",
+                    f"▎内容: {translated_message}\n",
+                    "-------------\n",
+                    _DISPATCH_FOOTER
+                ]))
             
             return messages
             
@@ -421,6 +704,29 @@ class DispatchService(APIRetryMixin):
             bot_logger.error(f"格式化快讯数据时发生错误: {e}")
             return ["\n❌ 数据格式化失败，请稍后重试。"]
     
+    def _schedule_background_translation(self, dispatches: List[Dispatch]) -> None:
+        """
+        在后台批量翻译并缓存快讯，同一快讯同时只会有一个翻译任务（single-flight）
+        
+        Args:
+            dispatches: 需要翻译的快讯记录列表
+        """
+        pending = [dispatch for dispatch in dispatches if dispatch.id not in self._inflight_translations]
+        if not pending:
+            bot_logger.debug("所有缺少翻译的快讯均已有进行中的后台翻译任务")
+            return
+        
+        task = asyncio.create_task(self._translate_and_cache_dispatches(pending))
+        dispatch_ids = [dispatch.id for dispatch in pending]
+        for dispatch_id in dispatch_ids:
+            self._inflight_translations[dispatch_id] = task
+        
+        def _release(_):
+            for dispatch_id in dispatch_ids:
+                self._inflight_translations.pop(dispatch_id, None)
+        
+        task.add_done_callback(_release)
+    
     def _format_time(self, time_str: str) -> str:
         """
         格式化时间字符串
@@ -431,16 +737,7 @@ class DispatchService(APIRetryMixin):
         Returns:
             格式化后的时间字符串
         """
-        try:
-            # 解析ISO时间格式
-            dt = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
-            
-            # 转换为本地时间显示
-            local_dt = dt.replace(tzinfo=timezone.utc).astimezone()
-            
-            return local_dt.strftime("%Y-%m-%d %H:%M:%S")
-        except (ValueError, AttributeError):
-            return "未知时间"
+        return _format_time_cached(time_str)
     
     def _get_dispatch_type_name(self, dispatch_type: int) -> str:
         """
@@ -452,14 +749,7 @@ class DispatchService(APIRetryMixin):
         Returns:
             快讯类型名称
         """
-        type_names = {
-            0: "一般快讯",
-            1: "紧急通告", 
-            2: "战术更新",
-            3: "系统公告"
-        }
-        
-        return type_names.get(dispatch_type, f"类型{dispatch_type}")
+        return _DISPATCH_TYPE_NAMES.get(dispatch_type, f"类型{dispatch_type}")
 
 
 # 创建全局快讯服务实例
@@ -2,40 +2,53 @@
 """
 Helldivers 2 最高命令核心业务模块
 """
-from typing import Dict, Any, Optional, List
-import sys
-import os
-import aiohttp
+from typing import Dict, Any, Optional, List, Tuple
 import asyncio
-
-# 确保正确的路径设置
-current_dir = os.path.dirname(__file__)
-project_root = os.path.dirname(current_dir)
-
-# 添加项目根目录到路径
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
-
-# 从项目根目录导入
-import importlib.util
-hd2_api_spec = importlib.util.spec_from_file_location("hd2_api_manager", os.path.join(project_root, "utils", "hd2_api_manager.py"))
-hd2_api_module = importlib.util.module_from_spec(hd2_api_spec)
-hd2_api_spec.loader.exec_module(hd2_api_module)
-hd2_api = hd2_api_module.hd2_api
+import hashlib
+import time
+import orjson
 
 from utils.logger import bot_logger
 from utils.translation_cache import translation_cache
 from utils.translation_retry_queue import translation_retry_queue
-from core.news import TranslationService, clean_game_text
-from datetime import datetime
+from utils.hd2_cache import hd2_cache_service
+from core.news import translation_service, clean_game_text
 
+# 最高命令消息的分隔线与固定页脚
+_ORDER_SEPARATOR = "-------------\n"
+_ORDER_FOOTER = f"{_ORDER_SEPARATOR}执行命令，为了超级地球！🌍"
+
+# 每个翻译请求合并的最高命令数量
+_ORDER_BATCH_SIZE = 8
+
+# 渲染结果缓存的有效期（秒）
+_RENDERED_TTL = 3600
+
+
+def _format_percentage(percentage: float) -> str:
+    """
+    智能格式化百分比：数值越小保留的小数位越多
+    
+    Args:
+        percentage: 百分比数值
+    
+    Returns:
+        格式化后的百分比字符串
+    """
+    precision = 1 if percentage >= 10 else 2 if percentage >= 1 else 3
+    return f"{percentage:.{precision}f}%"
 
 
 class OrderService:
     """最高命令服务（基于智能缓存）"""
     
     def __init__(self):
-        self.translation_service = TranslationService()
+        self.translation_service = translation_service
+        self._inflight_translations: Dict[str, asyncio.Task] = {}
+        self._translate_sem = asyncio.Semaphore(3)
+        self._refresh_task: Optional[asyncio.Task] = None
+        # 最近一次完整翻译的渲染结果：(数据摘要, 过期时间, 消息列表)
+        self._rendered: Optional[Tuple[str, float, List[str]]] = None
     
     async def get_current_orders(self) -> Optional[List[Dict[str, Any]]]:
         """
@@ -45,7 +58,6 @@ class OrderService:
             包含最高命令数据的列表，失败时返回 None
         """
         try:
-            from utils.hd2_cache import hd2_cache_service
             orders_data = await hd2_cache_service.get_major_orders()
             if orders_data:
                 bot_logger.debug("从缓存获取最高命令数据成功")
@@ -61,7 +73,21 @@ class OrderService:
     async def refresh_cache_if_needed(self) -> bool:
         """
         检查并刷新缓存（如果需要）
-        由轮转系统调用此方法进行定期刷新
+        由轮转系统调用此方法进行定期刷新，并发调用共享同一次刷新结果
+        
+        Returns:
+            True 如果缓存已刷新
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_cache())
+        else:
+            bot_logger.debug("最高命令缓存刷新进行中，等待其结果")
+        # 调用方被取消时不影响共享的刷新任务
+        return await asyncio.shield(self._refresh_task)
+    
+    async def _refresh_cache(self) -> bool:
+        """
+        执行一次缓存检查与刷新
         
         Returns:
             True 如果缓存已刷新
@@ -73,8 +99,9 @@ class OrderService:
                 bot_logger.warning("无法获取新的最高命令数据，跳过缓存刷新")
                 return False
             
-            # 检查是否需要刷新
-            needs_refresh = await translation_cache.check_content_freshness('orders', new_orders)
+            # 比较需翻译内容的指纹，未变化时无需逐项检查
+            fingerprint = self._content_fingerprint(new_orders)
+            needs_refresh = fingerprint != await translation_cache.get_content_fingerprint('orders')
             
             if needs_refresh:
                 bot_logger.info("开始刷新最高命令缓存...")
@@ -89,8 +116,10 @@ class OrderService:
                 # 更新内容索引
                 await translation_cache.store_content_list('orders', new_orders)
                 
-                # 更新刷新时间戳
+                # 更新刷新时间戳和内容指纹
                 await translation_cache.update_refresh_timestamp('orders')
+                await translation_cache.store_content_fingerprint('orders', fingerprint)
+                self._rendered = None
                 
                 bot_logger.info("最高命令缓存刷新完成")
                 return True
@@ -103,13 +132,59 @@ class OrderService:
             bot_logger.error(f"刷新最高命令缓存时发生错误: {e}")
             return False
     
-    async def _translate_and_cache_orders(self, orders: List[Dict[str, Any]]) -> None:
+    @staticmethod
+    def _content_fingerprint(orders: List[Dict[str, Any]]) -> str:
+        """
+        计算最高命令中需翻译内容的指纹（进度、剩余时间等频繁变化的字段不参与计算）
+        
+        Args:
+            orders: 最高命令数据列表
+        
+        Returns:
+            十六进制指纹字符串
+        """
+        content = []
+        for order in orders:
+            setting = order.get("setting") or {}
+            content.append([
+                order.get('id'),
+                setting.get("overrideTitle"),
+                setting.get("overrideBrief"),
+                setting.get("taskDescription")
+            ])
+        return hashlib.blake2b(orjson.dumps(content), digest_size=16).hexdigest()
+    
+    @staticmethod
+    def _task_targets(setting: Dict[str, Any]) -> List[Optional[int]]:
+        """
+        提取各任务的目标值，与进度列表按位置对齐
+        
+        Args:
+            setting: 最高命令的 setting 字段
+        
+        Returns:
+            目标值列表，无有效目标的任务对应 None
+        """
+        targets = []
+        for task in setting.get("tasks", []):
+            # 根据HD2-API文档，目标值通常在第3个位置 (index 2)
+            task_values = task.get("values") or []
+            target = task_values[2] if len(task_values) > 2 else None
+            targets.append(target if target and target > 0 else None)
+        return targets
+    
+    async def _translate_and_cache_orders(self, orders: List[Dict[str, Any]], force: bool = False) -> None:
         """
         翻译并缓存最高命令数据
         
+        所有需要翻译的命令字段合并为一次批量翻译请求。
+        
         Args:
             orders: 最高命令数据列表
+            force: 调用方已确认这些命令没有有效翻译时为True，跳过缓存检查
         """
+        # 提取各命令的原文字段：(命令ID, 比较用原文, [标题, 简介, 任务], 任务目标值)
+        candidates = []
         for order in orders:
             try:
                 item_id = str(order.get('id', 0))
@@ -120,75 +195,116 @@ class OrderService:
                 original_brief = setting.get("overrideBrief", "")
                 original_task = setting.get("taskDescription", "")
                 
-                if not any([original_title, original_brief, original_task]):
+                if not (original_title or original_brief or original_task):
                     continue
                 
-                # 检查是否已有翻译缓存
-                cached_translation = await translation_cache.get_translated_content('orders', item_id)
-                
                 # 构建用于比较的原文
                 original_text = f"{original_title}\n{original_brief}\n{original_task}"
+                candidates.append((item_id, original_text, [original_title, original_brief, original_task]))
                 
-                # 如果没有缓存或原文发生变化，进行翻译
-                if not cached_translation or cached_translation.get('original_text') != original_text:
-                    bot_logger.info(f"翻译最高命令 #{item_id}...")
-                    
-                    # 翻译各个字段
-                    translated_title = ""
-                    translated_brief = ""
-                    translated_task = ""
-                    
-                    if original_title:
-                        title_result = await self.translation_service.translate_text(original_title, "zh")
-                        if title_result and title_result != original_title:
-                            translated_title = title_result
+            except Exception as e:
+                bot_logger.error(f"翻译最高命令 {order.get('id')} 时发生错误: {e}")
+        
+        # 一次批量读取所有命令的翻译缓存（强制翻译时无需再次读取）
+        if force:
+            cached_translations = [None] * len(candidates)
+        else:
+            cached_translations = await translation_cache.get_translated_contents(
+                'orders', [candidate[0] for candidate in candidates]
+            )
+        
+        # 收集需要翻译的命令
+        pending = []
+        for candidate, cached_translation in zip(candidates, cached_translations):
+            item_id, original_text = candidate[0], candidate[1]
+            
+            # 如果没有缓存或原文发生变化，进行翻译
+            if not cached_translation or cached_translation.get('original_text') != original_text:
+                bot_logger.info(f"翻译最高命令 #{item_id}...")
+                pending.append(candidate)
+            else:
+                bot_logger.debug(f"最高命令 #{item_id} 已有有效翻译缓存")
+        
+        if not pending:
+            return
+        
+        # 整批共用一个翻译时间戳（Unix秒）
+        translation_time = int(time.time())
+        
+        # 按批拆分，每批的各个字段合并为一次翻译请求；批次间并发执行，由信号量限制并发数
+        batches = [pending[i:i + _ORDER_BATCH_SIZE] for i in range(0, len(pending), _ORDER_BATCH_SIZE)]
+        results = await asyncio.gather(
+            *[self._translate_order_batch(batch, translation_time) for batch in batches],
+            return_exceptions=True
+        )
+        entries = []
+        for result in results:
+            if isinstance(result, BaseException):
+                bot_logger.error(f"批量翻译最高命令时发生错误: {result}")
+            else:
+                entries.extend(result)
+        
+        # 所有批次的翻译结果一次性写入缓存
+        await translation_cache.store_translated_contents('orders', entries)
+    
+    async def _translate_order_batch(
+        self, batch: List[Tuple[str, str, List[str]]], translation_time: int
+    ) -> List[Tuple[str, str, str, Dict[str, Any]]]:
+        """
+        翻译一批最高命令
+        
+        Args:
+            batch: (命令ID, 比较用原文, [标题, 简介, 任务]) 列表
+            translation_time: 本次翻译的时间戳（Unix秒）
+        
+        Returns:
+            待缓存的 (命令ID, 原文, 译文, 元数据) 列表
+        """
+        async with self._translate_sem:
+            results = await self.translation_service.translate_texts(
+                [field for _, _, originals in batch for field in originals], "zh"
+            )
+        
+        entries = []
+        for index, (item_id, original_text, originals) in enumerate(batch):
+            try:
+                translated_title, translated_brief, translated_task = [
+                    result if result and result != original else ""
+                    for original, result in zip(originals, results[index * 3:index * 3 + 3])
+                ]
+                original_title, original_brief, original_task = originals
+                
+                # 只有在至少一个字段成功翻译的情况下才进行缓存
+                if translated_title or translated_brief or translated_task:
+                    bot_logger.debug(f"最高命令 #{item_id} 至少有一部分翻译成功，进行缓存。")
                     
-                    if original_brief:
-                        brief_result = await self.translation_service.translate_text(original_brief, "zh")
-                        if brief_result and brief_result != original_brief:
-                            translated_brief = brief_result
+                    # 构建翻译结果（包含原文作为备份）
+                    final_title = translated_title if translated_title else original_title
+                    final_brief = translated_brief if translated_brief else original_brief
+                    final_task = translated_task if translated_task else original_task
+                    translated_text = f"{final_title}\n{final_brief}\n{final_task}"
                     
-                    if original_task:
-                        task_result = await self.translation_service.translate_text(original_task, "zh")
-                        if task_result and task_result != original_task:
-                            translated_task = task_result
+                    # 存储翻译结果
+                    metadata = {
+                        'translated_title': translated_title,
+                        'translated_brief': translated_brief,
+                        'translated_task': translated_task,
+                        'original_title': original_title,
+                        'original_brief': original_brief,
+                        'original_task': original_task,
+                        'translation_time': translation_time
+                    }
                     
-                    # 只有在至少一个字段成功翻译的情况下才进行缓存
-                    if any([translated_title, translated_brief, translated_task]):
-                        bot_logger.debug(f"最高命令 #{item_id} 至少有一部分翻译成功，进行缓存。")
-                        
-                        # 构建翻译结果（包含原文作为备份）
-                        final_title = translated_title if translated_title else original_title
-                        final_brief = translated_brief if translated_brief else original_brief
-                        final_task = translated_task if translated_task else original_task
-                        translated_text = f"{final_title}\n{final_brief}\n{final_task}"
-                        
-                        # 存储翻译结果
-                        metadata = {
-                            'translated_title': translated_title,
-                            'translated_brief': translated_brief,
-                            'translated_task': translated_task,
-                            'original_title': original_title,
-                            'original_brief': original_brief,
-                            'original_task': original_task,
-                            'translation_time': datetime.now().isoformat()
-                        }
-                        
-                        await translation_cache.store_translated_content(
-                            'orders', item_id, original_text, translated_text, metadata
-                        )
-                    else:
-                        bot_logger.warning(f"最高命令 #{item_id} 所有字段翻译失败，将添加到重试队列。")
-                        # (可选) 未来可以添加到翻译重试队列
-                        # await translation_retry_queue.add_retry_task(...)
+                    entries.append((item_id, original_text, translated_text, metadata))
                 else:
-                    bot_logger.debug(f"最高命令 #{item_id} 已有有效翻译缓存")
-                    
-                # 添加小延迟避免API调用过快
-                await asyncio.sleep(0.1)
+                    bot_logger.warning(f"最高命令 #{item_id} 所有字段翻译失败，将添加到重试队列。")
+                    # (可选) 未来可以添加到翻译重试队列
+                    # await translation_retry_queue.add_retry_task(...)
                 
             except Exception as e:
-                bot_logger.error(f"翻译最高命令 {order.get('id')} 时发生错误: {e}")
+                bot_logger.error(f"处理最高命令 {item_id} 翻译结果时发生错误: {e}")
+        
+        return entries
     
     async def format_order_messages(self, orders: List[Dict[str, Any]]) -> List[str]:
         """
@@ -204,33 +320,43 @@ class OrderService:
             if not orders:
                 return ["\n📋 当前没有活跃的最高命令"]
             
+            # 数据未变化时直接返回上次的渲染结果（新数据产生新摘要，旧结果自然失效）
+            digest = hashlib.blake2b(orjson.dumps(orders), digest_size=16).hexdigest()
+            rendered = self._rendered
+            if rendered and rendered[0] == digest and rendered[1] > time.monotonic():
+                bot_logger.debug("最高命令数据无变化，使用缓存的渲染结果")
+                return rendered[2]
+            
             messages = []
+            order_ids = [str(order.get('id', 0)) for order in orders]
             
-            for i, order in enumerate(orders, 1):
+            # 一次批量读取所有命令的翻译缓存
+            cached_translations = await translation_cache.get_translated_contents('orders', order_ids)
+            missing = [
+                index for index, cached_translation in enumerate(cached_translations)
+                if not (
+                    cached_translation and cached_translation.get('metadata') and
+                    (
+                        cached_translation['metadata'].get('translated_title') or
+                        cached_translation['metadata'].get('translated_brief') or
+                        cached_translation['metadata'].get('translated_task')
+                    )
+                )
+            ]
+            
+            # 缺少翻译的命令本次显示原文，并在后台批量翻译（stale-while-revalidate）
+            if missing:
+                bot_logger.info(f"{len(missing)} 条最高命令没有有效翻译，本次显示原文并在后台翻译")
+                self._schedule_background_translation([orders[index] for index in missing])
+            
+            for i, (order, order_id, cached_translation) in enumerate(zip(orders, order_ids, cached_translations), 1):
                 setting = order.get("setting", {})
-                order_id = str(order.get('id', 0))
                 
                 # 获取原始内容
                 title = setting.get("overrideTitle", "未知命令")
                 brief = setting.get("overrideBrief", "")
                 task_desc = setting.get("taskDescription", "")
                 
-                # 检查翻译并按需刷新
-                cached_translation = await translation_cache.get_translated_content('orders', order_id)
-                is_translated = (
-                    cached_translation and cached_translation.get('metadata') and
-                    any([
-                        cached_translation['metadata'].get('translated_title'),
-                        cached_translation['metadata'].get('translated_brief'),
-                        cached_translation['metadata'].get('translated_task')
-                    ])
-                )
-
-                if not is_translated:
-                    bot_logger.info(f"最高命令 #{order_id} 没有有效翻译，尝试强制刷新...")
-                    await self._translate_and_cache_orders([order])
-                    cached_translation = await translation_cache.get_translated_content('orders', order_id) # 重新获取
-                
                 # 从缓存获取翻译内容
                 translated_title = title
                 translated_brief = brief
@@ -249,8 +375,8 @@ class OrderService:
                 
                 # 清理游戏格式标签
                 translated_title = clean_game_text(translated_title)
-                translated_brief = clean_game_text(translated_brief)
-                translated_task = clean_game_text(translated_task)
+                translated_brief = clean_game_text(translated_brief) if translated_brief else ""
+                translated_task = clean_game_text(translated_task) if translated_task else ""
                 
                 # 使用翻译后的内容
                 title = translated_title
@@ -258,71 +384,81 @@ class OrderService:
                 task_desc = translated_task
                 
                 # 构建单个命令的消息
-                message = f"\n📋 最高命令 {i} | HELLDIVERS 2\n"
-                message += "-------------\n"
-                message += f"▎命令: {title}\n"
+                parts = [
+                    f"\n📋 最高命令 {i} | HELLDIVERS 2\n",
+                    _ORDER_SEPARATOR,
+                    f"▎命令: {title}\n"
+                ]
                 
                 if brief:
-                    message += f"▎简介: {brief}\n"
+                    parts.append(f"▎简介: {brief}\n")
                 
                 if task_desc:
-                    message += f"▎任务: {task_desc}\n"
+                    parts.append(f"▎任务: {task_desc}\n")
                 
                 # --- 重新设计进度显示 ---
-                tasks = setting.get("tasks", [])
-                progress = order.get("progress", [])
-
-                for i, task in enumerate(tasks):
-                    # 确保进度和任务数据可用
-                    if i < len(progress) and task.get("values"):
-                        task_values = task.get("values", [])
-                        
-                        # 根据HD2-API文档，目标值通常在第3个位置 (index 2)
-                        if len(task_values) > 2:
-                            current_progress = progress[i]
-                            target = task_values[2]
-                            
-                            if target > 0:
-                                percentage = (current_progress / target) * 100
-                                # 智能格式化百分比
-                                if percentage >= 10:
-                                    formatted_progress = f"{percentage:.1f}%"
-                                elif percentage >= 1:
-                                    formatted_progress = f"{percentage:.2f}%"
-                                else:
-                                    formatted_progress = f"{percentage:.3f}%"
-                                
-                                message += f"▎任务{i+1}进度: {formatted_progress} ({current_progress:,} / {target:,})\n"
+                # 任务目标值可能在命令文本不变的情况下调整，每次都从实时数据提取
+                task_targets = self._task_targets(setting)
+                
+                for task_no, (current_progress, target) in enumerate(zip(order.get("progress", []), task_targets), 1):
+                    if target:
+                        formatted_progress = _format_percentage((current_progress / target) * 100)
+                        parts.append(f"▎任务{task_no}进度: {formatted_progress} ({current_progress:,} / {target:,})\n")
 
                 # --- 剩余时间与结束时间 ---
                 expires_in = order.get("expiresIn", 0)
                 if expires_in > 0:
-                    from datetime import datetime, timedelta
-                    
                     # 剩余时间
                     hours = expires_in // 3600
                     minutes = (expires_in % 3600) // 60
                     if hours > 0:
-                        message += f"▎剩余时间: {hours}小时{minutes}分钟\n"
+                        parts.append(f"▎剩余时间: {hours}小时{minutes}分钟\n")
                     else:
-                        message += f"▎剩余时间: {minutes}分钟\n"
+                        parts.append(f"▎剩余时间: {minutes}分钟\n")
                 
                 # 显示奖励
                 reward = setting.get("reward")
                 if reward and reward.get("amount", 0) > 0:
                     reward_amount = reward.get("amount", 0)
-                    message += f"▎奖励: {reward_amount:,}奖章\n"
+                    parts.append(f"▎奖励: {reward_amount:,}奖章\n")
                 
-                message += "-------------\n"
-                message += "执行命令，为了超级地球！🌍"
+                parts.append(_ORDER_FOOTER)
                 
-                messages.append(message)
+                messages.append("".join(parts))
+            
+            # 只缓存全部命令都有翻译的结果，显示原文的结果需在后台翻译完成后重新渲染
+            if not missing:
+                self._rendered = (digest, time.monotonic() + _RENDERED_TTL, messages)
             
             return messages
             
         except Exception as e:
             bot_logger.error(f"格式化最高命令数据时发生错误: {e}")
             return ["\n❌ 数据格式化失败，请稍后重试。"]
+    
+    def _schedule_background_translation(self, orders: List[Dict[str, Any]]) -> None:
+        """
+        在后台批量翻译并缓存最高命令，同一命令同时只会有一个翻译任务（single-flight）
+        
+        Args:
+            orders: 需要翻译的最高命令数据列表
+        """
+        pending = [order for order in orders if str(order.get('id', 0)) not in self._inflight_translations]
+        if not pending:
+            bot_logger.debug("所有缺少翻译的最高命令均已有进行中的后台翻译任务")
+            return
+        
+        # 渲染路径刚读取过缓存并确认缺少翻译，后台任务无需重复读取
+        task = asyncio.create_task(self._translate_and_cache_orders(pending, force=True))
+        order_ids = [str(order.get('id', 0)) for order in pending]
+        for order_id in order_ids:
+            self._inflight_translations[order_id] = task
+        
+        def _release(_):
+            for order_id in order_ids:
+                self._inflight_translations.pop(order_id, None)
+        
+        task.add_done_callback(_release)
 
 # 创建全局最高命令服务实例
 order_service = OrderService()
@@ -21,6 +21,7 @@ from utils.browser import browser_manager
 from utils.redis_manager import redis_manager
 from utils.provider_manager import get_provider_manager
 from utils.image_manager import image_manager
+from utils.http_client import close_http_session
 from core.api import get_app, set_core_app
 from core.constants import CLEANUP_TIMEOUT
 from core.signal_utils import ensure_exit, setup_signal_handlers
@@ -199,7 +200,14 @@ async def _async_main() -> None:
             bot_logger.info("缓存系统已停止")
         except Exception as e:
             bot_logger.error(f"停止缓存系统时发生错误: {e}")
-        
+
+        # 关闭共享的HTTP会话
+        try:
+            await close_http_session()
+            bot_logger.info("HTTP会话已关闭")
+        except Exception as e:
+            bot_logger.error(f"关闭HTTP会话时发生错误: {e}")
+
         if platforms:
             await asyncio.gather(*(p.stop() for p in platforms), return_exceptions=True)
         if core_app:
@@ -2,30 +2,68 @@
 一个为TheFinals排行榜深度搜索优化的、基于内存的倒排索引器。
 """
 
+import asyncio
+import functools
 import re
-from collections import defaultdict
-from typing import List, Dict, Any, Set
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import List, Dict, Any, FrozenSet, Optional, Tuple
 from difflib import SequenceMatcher
 from utils.logger import bot_logger
 import heapq
 
-def get_trigrams(text: str) -> Set[str]:
-    """将文本规范化（小写并移除特殊字符）后，分解为三元组。"""
-    # 移除所有非字母数字字符
-    normalized_text = re.sub(r'[^a-z0-9]+', '', text.lower())
+# 参与模糊匹配的别名字段
+_ALIAS_FIELDS = ('steam', 'psn', 'xbox')
+_EMPTY_TRIGRAMS: FrozenSet[int] = frozenset()
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+# 进入精确评分的候选人数量上限
+_MAX_CANDIDATES = 50
+# 有效结果的最低相似度
+_MIN_SIMILARITY = 0.3
+
+@functools.lru_cache(maxsize=16384)
+def get_trigrams(text: str) -> FrozenSet[int]:
+    """
+    将文本规范化（小写并移除特殊字符）后，分解为三元组（结果按原文缓存）。
+    每个三元组的三个ASCII字符打包为一个24位整数，比3字符字符串更省内存、哈希更快。
+    """
+    # 移除所有非字母数字字符，剩余字符均为ASCII
+    normalized_text = _NON_ALNUM_RE.sub('', text.lower())
     # 添加边界标记
-    normalized_text = f" {normalized_text} "
-    if len(normalized_text) < 4: # 如果规范化后太短，无法生成三元组
-        return set()
-    return {normalized_text[i:i+3] for i in range(len(normalized_text) - 2)}
+    codes = f" {normalized_text} ".encode('ascii')
+    if len(codes) < 4: # 如果规范化后太短，无法生成三元组
+        return _EMPTY_TRIGRAMS
+    return frozenset((codes[i] << 16) | (codes[i+1] << 8) | codes[i+2] for i in range(len(codes) - 2))
+
+def _top_candidates(candidate_scores: Dict[str, int], k: int) -> List[Tuple[str, int]]:
+    """
+    用大小为 k 的最小堆流式选出初步分数最高的候选人，按分数降序返回。
+    分数相同时保留先出现的候选人，与 heapq.nlargest 的结果一致。
+    """
+    heap: List[Tuple[int, int, str]] = []
+    heappush, heapreplace = heapq.heappush, heapq.heapreplace
+    for order, (player_id, score) in enumerate(candidate_scores.items()):
+        if len(heap) < k:
+            heappush(heap, (score, -order, player_id))
+        elif score > heap[0][0]:
+            heapreplace(heap, (score, -order, player_id))
+    heap.sort(reverse=True)
+    return [(player_id, score) for score, _, player_id in heap]
 
 class SearchIndexer:
     """
     管理玩家姓名的倒排索引，并提供高效的搜索功能。
     """
     def __init__(self):
-        self._index: Dict[str, Set[str]] = defaultdict(set)
+        self._index: Dict[int, FrozenSet[str]] = {}
         self._player_data: Dict[str, Dict[str, Any]] = {}
+        # 每名玩家各名字字段的 (小写#号前部分, 三元组)，构建索引时预先计算
+        self._player_names: Dict[str, Tuple[Tuple[str, FrozenSet[int]], ...]] = {}
+        # 小写完整玩家名 -> 玩家ID列表，用于精确搜索直接查表
+        self._full_names: Dict[str, List[str]] = {}
+        # 按字母序排列的 (小写名字#号前部分, 玩家ID)，含别名，用于二分查找前缀匹配
+        self._sorted_name_parts: List[Tuple[str, str]] = []
         self._name_field = "name"
         self._is_ready = False
         bot_logger.info("[SearchIndexer] 搜索索引器已初始化。")
@@ -42,6 +80,9 @@ class SearchIndexer:
         bot_logger.info(f"[SearchIndexer] 开始构建索引，共 {len(players)} 名玩家...")
         new_index = defaultdict(set)
         new_player_data = {}
+        new_player_names = {}
+        new_full_names = defaultdict(list)
+        new_name_parts = []
 
         for player in players:
             player_id = player.get("name")
@@ -55,26 +96,47 @@ class SearchIndexer:
             player_copy['score'] = player.get('rankScore', player.get('fame', 0))
             new_player_data[player_id] = player_copy
 
+            name_lower = name.lower()
+            new_full_names[name_lower].append(player_id)
+
             # 为玩家名字建立索引 (只索引#号前的部分)
-            name_to_index = name.split('#')[0]
-            for trigram in get_trigrams(name_to_index):
+            name_part = name_lower.partition('#')[0]
+            new_name_parts.append((name_part, player_id))
+            name_trigrams = get_trigrams(name_part)
+            for trigram in name_trigrams:
                 new_index[trigram].add(player_id)
+            player_names = [(name_part, name_trigrams)]
             
             # (可选) 为其他字段建立索引，如 'steam', 'psn', 'xbox'
-            for key in ['steam', 'psn', 'xbox']:
+            for key in _ALIAS_FIELDS:
                 if alias := player.get(key):
                     for trigram in get_trigrams(alias):
                         new_index[trigram].add(player_id)
+                    alias_part = alias.lower().partition('#')[0]
+                    new_name_parts.append((alias_part, player_id))
+                    player_names.append((alias_part, get_trigrams(alias_part)))
+            new_player_names[player_id] = tuple(player_names)
 
-        # 原子性地替换旧索引
-        self._index = new_index
+        # 冻结为普通字典与不可变倒排表后，原子性地替换旧索引（读取时不会意外插入空集合）
+        self._index = {trigram: frozenset(player_ids) for trigram, player_ids in new_index.items()}
         self._player_data = new_player_data
+        self._player_names = new_player_names
+        self._full_names = dict(new_full_names)
+        new_name_parts.sort()
+        self._sorted_name_parts = new_name_parts
         
         if not self._is_ready:
             self._is_ready = True
         
         bot_logger.info(f"[SearchIndexer] 索引构建完成。索引词条数: {len(self._index)}")
 
+    async def build_index_async(self, players: List[Dict[str, Any]]):
+        """
+        在工作线程中构建索引，避免大规模重建阻塞事件循环。
+        新索引构建完成后才整体替换，期间的搜索仍使用旧索引。
+        """
+        await asyncio.to_thread(self.build_index, players)
+
     def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
         使用倒排索引和优化的评分模型高效地搜索玩家。
@@ -101,26 +163,46 @@ class SearchIndexer:
                 return []
             return []
 
-        # 2. 在索引中查找候选玩家
-        candidate_scores = defaultdict(int)
-        for trigram in query_trigrams:
-            if trigram in self._index:
-                for player_id in self._index[trigram]:
-                    candidate_scores[player_id] += 1
-        
-        if not candidate_scores:
-            bot_logger.debug(f"[SearchIndexer] 未找到与 '{search_term}' 匹配的候选人。")
-            return []
-
-        # 3. 对候选人进行相似度计算和评分
-        scored_candidates = []
         query_lower = query.lower()
         search_term_lower = search_term.lower()
-        
-        # 只对初步分数最高的50个候选人进行精确计算
-        top_candidate_ids = heapq.nlargest(50, candidate_scores.items(), key=lambda item: item[1])
+        search_term_length = len(search_term_lower)
+        query_trigram_count = len(query_trigrams)
+
+        # 2. 快速路径：精确搜索直接查表；模糊搜索先用二分查找收集名字前缀匹配，
+        #    数量足够时跳过倒排索引扫描（精确/前缀匹配的得分总高于包含匹配和Jaccard匹配）
+        if is_precise_search:
+            fast_ids = self._full_names.get(query_lower, [])
+        else:
+            fast_ids = self._prefix_matches(search_term_lower)
+            if fast_ids is not None and len(fast_ids) < limit:
+                fast_ids = None
 
-        for player_id, _ in top_candidate_ids:
+        if fast_ids is not None:
+            bot_logger.debug(f"[SearchIndexer] 快速路径命中 {len(fast_ids)} 名候选人。")
+            # 初步分数与倒排索引扫描的计数一致：命中的查询三元组数量
+            top_candidate_ids = [
+                (player_id, sum(1 for trigram in query_trigrams if player_id in self._index.get(trigram, ())))
+                for player_id in fast_ids
+            ]
+        else:
+            # 3. 在索引中查找候选玩家
+            # Counter 对可迭代对象的计数在C层完成，避免逐个倒排项的Python循环
+            index = self._index
+            candidate_scores = Counter(chain.from_iterable(
+                index[trigram] for trigram in query_trigrams if trigram in index
+            ))
+            
+            if not candidate_scores:
+                bot_logger.debug(f"[SearchIndexer] 未找到与 '{search_term}' 匹配的候选人。")
+                return []
+
+            # 只对初步分数最高的50个候选人进行精确计算
+            top_candidate_ids = _top_candidates(candidate_scores, _MAX_CANDIDATES)
+
+        # 4. 对候选人进行相似度计算和评分
+        scored_candidates = []
+
+        for player_id, trigram_hits in top_candidate_ids:
             player = self._player_data.get(player_id)
             if not player:
                 continue
@@ -135,43 +217,59 @@ class SearchIndexer:
                     max_similarity = 5.0  # 给予非常高的分数以确保其排在首位
             # 模式2: 模糊搜索 (查询不包含#)
             else:
-                names_to_check = [main_name] + [player.get(k, "") for k in ['steam', 'psn', 'xbox']]
-                
-                for name in filter(None, names_to_check):
-                    name_part = name.split('#')[0].lower()
-                    
-                    similarity = 0.0
-                    if name_part == search_term_lower:
-                        similarity = 3.0  # 精确匹配
-                    elif name_part.startswith(search_term_lower):
-                        similarity = 2.0 + (len(search_term_lower) / len(name_part))  # 前缀匹配
-                    elif search_term_lower in name_part:
-                        similarity = 1.0 + (len(search_term_lower) / len(name_part))  # 包含匹配
+                for name_part, name_trigrams in self._player_names.get(player_id, ()):
+                    # 一次子串查找同时判定精确、前缀和包含匹配
+                    position = name_part.find(search_term_lower)
+                    if position == 0:
+                        if len(name_part) == search_term_length:
+                            similarity = 3.0  # 精确匹配
+                        else:
+                            similarity = 2.0 + (search_term_length / len(name_part))  # 前缀匹配
+                    elif position > 0:
+                        similarity = 1.0 + (search_term_length / len(name_part))  # 包含匹配
                     else:
-                        name_trigrams = get_trigrams(name_part)
-                        if name_trigrams:
-                            intersection = len(query_trigrams.intersection(name_trigrams))
-                            union = len(query_trigrams.union(name_trigrams))
-                            if union > 0:
-                                similarity = intersection / union  # Jaccard 相似度
+                        similarity = 0.0
+                        name_trigram_count = len(name_trigrams)
+                        # Jaccard 相似度不超过两集合大小之比；该上界不足以超过当前最高分或阈值时，
+                        # 无论交集多大都不会影响结果，直接跳过集合运算
+                        if name_trigram_count and (
+                            min(query_trigram_count, name_trigram_count) >
+                            max(query_trigram_count, name_trigram_count) * max(max_similarity, _MIN_SIMILARITY)
+                        ):
+                            # Jaccard 相似度：并集大小由容斥原理得出，只需一次集合运算
+                            intersection = len(query_trigrams & name_trigrams)
+                            similarity = intersection / (query_trigram_count + name_trigram_count - intersection)
                     
                     if similarity > max_similarity:
                         max_similarity = similarity
+                        # 精确匹配已是模糊搜索的最高分，无需再比较其余名字
+                        if max_similarity >= 3.0:
+                            break
             
             # 只有相似度大于阈值才被认为是有效结果
-            if max_similarity > 0.3:
-                final_score = candidate_scores[player_id] + (max_similarity * 10)
+            if max_similarity > _MIN_SIMILARITY:
+                final_score = trigram_hits + (max_similarity * 10)
                 scored_candidates.append((final_score, player))
 
-        # 4. 获取 Top-N 结果
+        # 5. 获取 Top-N 结果
         top_results = heapq.nlargest(limit, scored_candidates, key=lambda item: item[0])
         bot_logger.debug(f"[SearchIndexer] Top {len(top_results)} results: {[(s, p['name']) for s, p in top_results]}")
 
-        # 5. 格式化并返回
-        results = []
-        for score, player in top_results:
-            player_with_score = player.copy()
-            player_with_score['similarity_score'] = score
-            results.append(player_with_score)
-        
-        return results 
\ No newline at end of file
+        # 6. 格式化并返回（一次性构建带分数的新字典，不修改索引中的玩家数据）
+        return [{**player, 'similarity_score': score} for score, player in top_results]
+
+    def _prefix_matches(self, prefix: str) -> Optional[List[str]]:
+        """
+        二分查找名字（或别名）以指定前缀开头的玩家。
+        匹配数超过候选人上限时返回 None，由调用方回退到倒排索引扫描。
+        """
+        name_parts = self._sorted_name_parts
+        player_ids: Dict[str, None] = {}
+        for position in range(bisect_left(name_parts, (prefix,)), len(name_parts)):
+            name_part, player_id = name_parts[position]
+            if not name_part.startswith(prefix):
+                break
+            player_ids[player_id] = None
+            if len(player_ids) > _MAX_CANDIDATES:
+                return None
+        return list(player_ids)
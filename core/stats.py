@@ -6,8 +6,7 @@ from typing import Dict, Any, Optional
 import sys
 import os
 import aiohttp
-import asyncio
-from datetime import datetime, timezone
+from datetime import datetime
 
 # 确保正确的路径设置
 current_dir = os.path.dirname(__file__)
@@ -20,6 +19,55 @@ if project_root not in sys.path:
 from utils.logger import bot_logger
 from utils.cache_manager import api_cache_manager, CacheConfig
 from utils.config import Settings
+from utils.http_client import get_http_session
+
+# war API请求头
+_WAR_API_HEADERS = {
+    'X-Super-Client': 'hd2_qqbot',
+    'X-Super-Contact': 'xiaoyueyoqwq@vaiiya.org',
+    'User-Agent': 'Helldivers2-QQBot/1.0',
+    'Accept': 'application/json'
+}
+
+# 战争统计消息模板，字段取自统计数据（缺失字段按0处理）及 format_stats_message 中补充的派生字段
+_STATS_TEMPLATE = (
+    "\n📊 银河战争统计 | HELLDIVERS 2\n"
+    "-------------\n"
+    "🌌战争信息\n"
+    "▎在线玩家: {playerCount:,}\n"
+    "▎影响系数: {impactMultiplier:.6f}\n"
+    "▎发射子弹: {bulletsFired:,}\n"
+    "▎冻肉储备数: {friendlies:,}\n"
+    "-------------\n"
+    "📜任务统计\n"
+    "▎胜利任务: {missionsWon:,}\n"
+    "▎失败任务: {missionsLost:,}\n"
+    "▎成功率: {missionSuccessRate:.1f}%\n"
+    "▎总任务时间: {timePlayedHours:,}小时\n"
+    "-------------\n"
+    "⚔️战斗统计\n"
+    "▎虫族击杀: {terminidKills:,}\n"
+    "▎机器人击杀: {automatonKills:,}\n"
+    "▎光能族击杀: {illuminateKills:,}\n"
+    "▎阵亡次数: {deaths:,}\n"
+    "▎TK伤亡: {friendlies:,}\n"
+    "-------------"
+)
+
+
+class _StatsFields(dict):
+    """统计字段映射，缺失的字段按0处理"""
+
+    def __missing__(self, key: str) -> int:
+        return 0
+
+
+def _numeric_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    """筛选出值为数值的字段（排除null、字符串、布尔值等不应按数字格式化的值）"""
+    return {
+        key: value for key, value in data.items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    }
 
 
 class StatsService:
@@ -43,26 +91,16 @@ class StatsService:
     async def _fetch_war_data(self) -> Optional[Dict[str, Any]]:
         """从API获取战争数据"""
         try:
-            headers = {
-                'X-Super-Client': 'hd2_qqbot',
-                'X-Super-Contact': 'xiaoyueyoqwq@vaiiya.org',
-                'User-Agent': 'Helldivers2-QQBot/1.0',
-                'Accept': 'application/json'
-            }
-            
-            async with aiohttp.ClientSession(
-                headers=headers,
-                timeout=self.timeout
-            ) as session:
-                bot_logger.debug(f"获取战争统计数据: {self.api_url}")
-                async with session.get(self.api_url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        bot_logger.debug("成功获取战争统计数据")
-                        return data
-                    else:
-                        bot_logger.warning(f"API请求失败，状态码: {response.status}")
-                        return None
+            session = await get_http_session()
+            bot_logger.debug(f"获取战争统计数据: {self.api_url}")
+            async with session.get(self.api_url, headers=_WAR_API_HEADERS, timeout=self.timeout) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    bot_logger.debug("成功获取战争统计数据")
+                    return data
+                else:
+                    bot_logger.warning(f"API请求失败，状态码: {response.status}")
+                    return None
         except Exception as e:
             bot_logger.error(f"获取战争统计数据时发生错误: {e}")
             return None
@@ -94,6 +132,24 @@ class StatsService:
             bot_logger.error(f"获取战争统计数据时发生异常: {e}", exc_info=True)
             return None
     
+    async def _get_war_overview(self) -> Optional[Dict[str, Any]]:
+        """
+        获取war API数据（含playerCount和impactMultiplier）
+        
+        优先读取本服务注册的定期刷新缓存，缓存为空时才直接请求API。
+        
+        Returns:
+            war API原始数据，失败时返回 None
+        """
+        try:
+            data = await api_cache_manager.get_cached_data("war_stats")
+            if data:
+                return data
+            return await self._fetch_war_data()
+        except Exception as e:
+            bot_logger.error(f"获取war API数据时发生错误: {e}")
+            return None
+    
     def _format_time_duration(self, started: str, now: str) -> str:
         """
         计算战争持续时间
@@ -131,77 +187,26 @@ class StatsService:
             格式化后的文本消息
         """
         try:
-            # 格式化数字，添加千位分隔符
-            def format_number(num):
-                if isinstance(num, (int, float)):
-                    return f"{num:,}"
-                return str(num)
-            
-            # 格式化百分比
-            def format_percentage(num):
-                if isinstance(num, (int, float)):
-                    return f"{num:.1f}%"
-                return str(num)
-            
-            # 格式化时间（秒转小时）
-            def format_time_hours(seconds):
-                if isinstance(seconds, (int, float)) and seconds > 0:
-                    hours = int(seconds // 3600)
-                    return f"{hours:,}小时"
-                return "0小时"
-            
             # 获取统计数据（适配两种数据格式）
             if 'statistics' in war_data:
                 # 来自原始API的格式：{'statistics': {...}}
-                statistics = war_data.get('statistics', {})
-                impact_multiplier = war_data.get('impactMultiplier', 0)
-                player_count = statistics.get('playerCount', 0)
+                overview = war_data
+                statistics = war_data.get('statistics') or {}
             else:
-                # 来自hd2_cache的格式：直接是统计数据，需要从原始API获取其他字段
+                # 来自hd2_cache的格式：直接是统计数据，playerCount和impactMultiplier需从war API数据获取
+                overview = await self._get_war_overview() or {}
                 statistics = war_data
-                # 尝试从原始API获取完整数据以获取playerCount和impactMultiplier
-                try:
-                    raw_data = await self._fetch_war_data()
-                    if raw_data:
-                        impact_multiplier = raw_data.get('impactMultiplier', 0)
-                        player_count = raw_data.get('statistics', {}).get('playerCount', 0)
-                    else:
-                        impact_multiplier = 0
-                        player_count = 0
-                except:
-                    impact_multiplier = 0
-                    player_count = 0
-            
-            message = "\n📊 银河战争统计 | HELLDIVERS 2\n"
-            message += "-------------\n"
-            message += "🌌战争信息\n"
-            message += f"▎在线玩家: {format_number(player_count)}\n"
-            message += f"▎影响系数: {impact_multiplier:.6f}\n"
-            message += f"▎发射子弹: {format_number(statistics.get('bulletsFired', 0))}\n"
-            message += f"▎冻肉储备数: {format_number(statistics.get('friendlies', 0))}\n"
-            message += "-------------\n"
-            message += "📜任务统计\n"
-            message += f"▎胜利任务: {format_number(statistics.get('missionsWon', 0))}\n"
-            message += f"▎失败任务: {format_number(statistics.get('missionsLost', 0))}\n"
-            message += f"▎成功率: {format_percentage(statistics.get('missionSuccessRate', 0))}\n"
-            message += f"▎总任务时间: {format_time_hours(statistics.get('timePlayed', 0))}\n"
-            message += "-------------\n"
-            message += "⚔️战斗统计\n"
+            # 只保留数值字段，缺失、null或非数值的字段按0显示，不影响其余字段
+            fields = _StatsFields(_numeric_fields(statistics))
+            fields['playerCount'] = _numeric_fields(overview.get('statistics') or {}).get('playerCount', 0)
+            fields['impactMultiplier'] = _numeric_fields(overview).get('impactMultiplier', 0)
             # 处理不同API的字段名差异
-            terminid_kills = statistics.get('terminidKills', 0) or statistics.get('bugKills', 0)
-            automaton_kills = statistics.get('automatonKills', 0)
-            illuminate_kills = statistics.get('illuminateKills', 0)
-            deaths = statistics.get('deaths', 0)
-            friendlies = statistics.get('friendlies', 0)
-            
-            message += f"▎虫族击杀: {format_number(terminid_kills)}\n"
-            message += f"▎机器人击杀: {format_number(automaton_kills)}\n"
-            message += f"▎光能族击杀: {format_number(illuminate_kills)}\n"
-            message += f"▎阵亡次数: {format_number(deaths)}\n"
-            message += f"▎TK伤亡: {format_number(friendlies)}\n"
-            message += "-------------"
+            fields['terminidKills'] = fields['terminidKills'] or fields['bugKills']
+            # 秒转小时
+            time_played = fields['timePlayed']
+            fields['timePlayedHours'] = int(time_played // 3600) if time_played > 0 else 0
             
-            return message
+            return _STATS_TEMPLATE.format_map(fields)
             
         except Exception as e:
             bot_logger.error(f"格式化统计数据时发生错误: {e}")
@@ -6,9 +6,13 @@ from typing import Dict, Any, Optional, List
 import sys
 import os
 import re
+import time
+import random
+import hashlib
 import aiohttp
 import asyncio
-from datetime import datetime, timezone
+import orjson
+from datetime import datetime
 
 # 确保正确的路径设置
 current_dir = os.path.dirname(__file__)
@@ -21,20 +25,44 @@ if project_root not in sys.path:
 from utils.logger import bot_logger
 from utils.translation_cache import translation_cache
 from utils.translation_retry_queue import translation_retry_queue
-from core.news import TranslationService, clean_game_text
-from utils.api_retry import APIRetryMixin
+from core.news import translation_service, clean_game_text, _format_time_cached
+from utils.api_retry import APIRetryMixin, APIStatusError
 from utils.config import settings
 from utils.hd2_cache import hd2_cache_service
+from utils.http_client import get_http_session
+from utils.circuit_breaker import CircuitBreaker
 
+# Steam更新API请求头
+_STEAM_API_HEADERS = {
+    'X-Super-Client': 'hd2_qqbot',
+    'X-Super-Contact': 'xiaoyueyoqwq@vaiiya.org',
+    'User-Agent': 'Helldivers2-QQBot/1.0'
+}
 
 class SteamService(APIRetryMixin):
     """Steam 更新日志服务（基于智能缓存）"""
     
+    # 全局单例，固定属性集合，不需要实例 __dict__
+    __slots__ = (
+        'api_url', 'timeout', 'translation_service',
+        '_request_headers', '_last_updates', '_breaker',
+        '_consecutive_failures', '_next_retry_at', '_refresh_task'
+    )
+    
     def __init__(self):
         super().__init__()
         self.api_url = "https://api.helldivers2.dev/api/v1/steam"
         self.timeout = aiohttp.ClientTimeout(total=10)
-        self.translation_service = TranslationService()
+        self.translation_service = translation_service
+        # 请求头（含条件请求所需的缓存校验信息）及对应的上次数据，每次获取到新数据时重新生成
+        self._request_headers: Dict[str, str] = _STEAM_API_HEADERS
+        self._last_updates: Optional[List[Dict[str, Any]]] = None
+        # API连续失败时熔断，冷却期内直接放弃请求
+        self._breaker = CircuitBreaker(fail_threshold=5, reset_timeout=60)
+        # 轮询退避：连续获取失败次数及下次允许轮询的时间（monotonic）
+        self._consecutive_failures = 0
+        self._next_retry_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
         
     async def fetch_steam_updates_from_api(self) -> Optional[List[Dict[str, Any]]]:
         """
@@ -43,44 +71,99 @@ class SteamService(APIRetryMixin):
         Returns:
             Steam更新列表或None(如果获取失败)
         """
-        # 设置必需的headers
-        headers = {
-            'X-Super-Client': 'hd2_qqbot',
-            'X-Super-Contact': 'xiaoyueyoqwq@vaiiya.org',
-            'User-Agent': 'Helldivers2-QQBot/1.0'
-        }
-        
         async def _api_call():
-            async with aiohttp.ClientSession(timeout=self.timeout) as session:
-                bot_logger.debug(f"正在从API获取Steam更新数据: {self.api_url}")
-                async with session.get(self.api_url, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        bot_logger.info(f"成功从API获取Steam更新数据，共 {len(data)} 条")
-                        
-                        # 按发布时间排序，最新的在前
-                        sorted_data = sorted(data, key=lambda x: x.get('publishedAt', ''), reverse=True)
-                        return sorted_data
-                    else:
-                        # 返回带状态码的响应对象，让重试机制处理
-                        class APIResponse:
-                            def __init__(self, status):
-                                self.status = status
-                        return APIResponse(response.status)
+            # 重试过程中触发熔断时返回None，结束重试
+            if self._breaker.is_open():
+                bot_logger.warning("Steam API连续请求失败，已熔断，暂停请求")
+                return None
+            try:
+                return await self._request_steam_updates()
+            except Exception:
+                self._breaker.record_failure()
+                raise
+        
+        if self._breaker.is_open():
+            bot_logger.debug("Steam API处于熔断冷却期，跳过本次请求")
+            return None
         
         # 使用重试机制调用API
-        result = await self.retry_api_call(_api_call)
+        return await self.retry_api_call(_api_call)
+    
+    async def _request_steam_updates(self) -> List[Dict[str, Any]]:
+        """
+        请求Steam更新API（单次请求，失败时抛出异常）
         
-        # 如果结果是APIResponse对象，说明请求失败
-        if hasattr(result, 'status'):
-            return None
-            
-        return result
+        Returns:
+            Steam更新列表（保持API返回的顺序）
+        """
+        # 已有上次的数据时请求头带有缓存校验信息，未变化时服务端返回无响应体的304
+        session = await get_http_session()
+        bot_logger.debug(f"正在从API获取Steam更新数据: {self.api_url}")
+        async with session.get(self.api_url, headers=self._request_headers, timeout=self.timeout) as response:
+            if response.status == 304 and self._last_updates is not None:
+                bot_logger.debug("Steam更新数据未变化 (304)，沿用上次的数据")
+                self._breaker.record_success()
+                return self._last_updates
+            elif response.status == 200:
+                data = orjson.loads(await response.read())
+                bot_logger.info(f"成功从API获取Steam更新数据，共 {len(data)} 条")
+                
+                # 生成带缓存校验信息的请求头，供后续条件请求直接复用
+                self._request_headers = self._conditional_headers(response.headers)
+                self._last_updates = data
+                self._breaker.record_success()
+                return data
+            else:
+                # 抛出带状态码的异常，让重试机制处理
+                raise APIStatusError(response.status)
+    
+    @staticmethod
+    def _conditional_headers(response_headers) -> Dict[str, str]:
+        """
+        根据响应的缓存校验信息生成条件请求头
+        
+        Args:
+            response_headers: API响应头
+        
+        Returns:
+            请求头，响应未提供校验信息时为默认请求头
+        """
+        conditional_headers = {}
+        if etag := response_headers.get('ETag'):
+            conditional_headers['If-None-Match'] = etag
+        if last_modified := response_headers.get('Last-Modified'):
+            conditional_headers['If-Modified-Since'] = last_modified
+        if not conditional_headers:
+            return _STEAM_API_HEADERS
+        return {**_STEAM_API_HEADERS, **conditional_headers}
+    
+    def should_poll_now(self) -> bool:
+        """
+        检查当前是否应该轮询Steam更新（连续获取失败后处于退避期时返回False）
+        
+        Returns:
+            True 如果可以轮询
+        """
+        return time.monotonic() >= self._next_retry_at
     
     async def refresh_cache_if_needed(self) -> bool:
         """
         检查并刷新缓存（如果需要）
-        由轮转系统调用此方法进行定期刷新
+        由轮转系统调用此方法进行定期刷新，并发调用共享同一次刷新结果
+        
+        Returns:
+            True 如果缓存已刷新
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_cache())
+        else:
+            bot_logger.debug("Steam更新缓存刷新进行中，等待其结果")
+        # 调用方被取消时不影响共享的刷新任务
+        return await asyncio.shield(self._refresh_task)
+    
+    async def _refresh_cache(self) -> bool:
+        """
+        执行一次缓存检查与刷新
         
         Returns:
             True 如果缓存已刷新
@@ -89,11 +172,25 @@ class SteamService(APIRetryMixin):
             # 获取最新的API数据
             new_updates = await self.fetch_steam_updates_from_api()
             if not new_updates:
-                bot_logger.warning("无法获取新的Steam更新数据，跳过缓存刷新")
+                # 指数退避（带抖动），退避期间轮转系统跳过轮询
+                self._consecutive_failures += 1
+                # 限制指数，避免长时间故障后 2**n 过大无法转换为浮点数（上限600秒已在2**10附近达到）
+                backoff = 2 ** min(self._consecutive_failures, 10)
+                delay = min(600, backoff + random.uniform(0, backoff))
+                self._next_retry_at = time.monotonic() + delay
+                bot_logger.warning(f"无法获取新的Steam更新数据，跳过缓存刷新，{delay:.0f}秒后重试")
                 return False
+            self._consecutive_failures = 0
+            self._next_retry_at = 0.0
             
-            # 只取最新一条更新进行检查
-            latest_update = new_updates[:1] if new_updates else []
+            # 只取发布时间最新的一条更新进行检查（单次扫描，无需整体排序）
+            latest_update = [max(new_updates, key=lambda x: x.get('publishedAt', ''))]
+            
+            # 内容指纹与上次刷新时一致则无需再做相似度比较
+            fingerprint = self._content_fingerprint(latest_update[0])
+            if fingerprint == await translation_cache.get_content_fingerprint('steam'):
+                bot_logger.debug("Steam更新内容指纹未变化，跳过缓存刷新")
+                return False
             
             # 检查是否需要刷新（比较相似度）
             needs_refresh = await translation_cache.check_content_freshness('steam', latest_update)
@@ -114,8 +211,9 @@ class SteamService(APIRetryMixin):
                 # 更新内容索引
                 await translation_cache.store_content_list('steam', updates_to_cache)
                 
-                # 更新刷新时间戳
+                # 更新刷新时间戳和内容指纹
                 await translation_cache.update_refresh_timestamp('steam')
+                await translation_cache.store_content_fingerprint('steam', fingerprint)
                 
                 bot_logger.info("Steam更新缓存刷新完成")
                 return True
@@ -128,6 +226,37 @@ class SteamService(APIRetryMixin):
             bot_logger.error(f"刷新Steam缓存时发生错误: {e}")
             return False
     
+    @staticmethod
+    def _content_fingerprint(update: Dict[str, Any]) -> str:
+        """
+        计算Steam更新的内容指纹
+        
+        Args:
+            update: Steam更新数据
+        
+        Returns:
+            十六进制指纹字符串
+        """
+        content = [update.get('id'), update.get('publishedAt'), update.get('title'), update.get('content')]
+        return hashlib.blake2b(orjson.dumps(content), digest_size=16).hexdigest()
+    
+    @staticmethod
+    def _original_hash(title: str, content: str) -> str:
+        """
+        计算Steam更新原文（标题+内容）的摘要，用于判断翻译缓存是否仍然有效
+        
+        Args:
+            title: 原文标题
+            content: 原文内容
+        
+        Returns:
+            十六进制摘要字符串
+        """
+        digest = hashlib.blake2b((title or '').encode(), digest_size=16)
+        digest.update(b'\n')
+        digest.update((content or '').encode())
+        return digest.hexdigest()
+    
     async def _translate_and_cache_updates(self, updates: List[Dict[str, Any]]) -> bool:
         """
         翻译并缓存Steam更新数据
@@ -153,26 +282,22 @@ class SteamService(APIRetryMixin):
                 # 检查是否已有翻译缓存
                 cached_translation = await translation_cache.get_translated_content('steam', item_id)
                 
-                # 构建用于比较的原文（标题+内容）
-                original_text = f"{original_title}\n{original_content}" if original_title and original_content else (original_title or original_content)
+                # 用标题+内容的摘要判断原文是否变化，缓存命中时无需拼接长文本
+                original_hash = self._original_hash(original_title, original_content)
+                cached_metadata = (cached_translation or {}).get('metadata') or {}
                 
                 # 如果没有缓存或原文发生变化，进行翻译
-                if not cached_translation or cached_translation.get('original_text') != original_text:
+                if cached_metadata.get('original_hash') != original_hash:
                     bot_logger.info(f"翻译Steam更新 #{item_id}...")
                     
-                    # 翻译标题和内容
-                    translated_title = ""
-                    translated_content = ""
-                    
-                    if original_title:
-                        title_result = await self.translation_service.translate_text(original_title, "zh")
-                        if title_result and title_result != original_title:
-                            translated_title = title_result
-                    
-                    if original_content:
-                        content_result = await self.translation_service.translate_text(original_content, "zh")
-                        if content_result and content_result != original_content:
-                            translated_content = content_result
+                    # 并发翻译标题和内容，出错或未翻译的字段留空
+                    title_result, content_result = await asyncio.gather(
+                        self._translate_field(original_title),
+                        self._translate_field(original_content),
+                        return_exceptions=True
+                    )
+                    translated_title = title_result if isinstance(title_result, str) and title_result != original_title else ""
+                    translated_content = content_result if isinstance(content_result, str) and content_result != original_content else ""
                     
                     # 如果翻译失败，则跳过此更新的缓存
                     if not translated_title and not translated_content and (original_title or original_content):
@@ -196,9 +321,14 @@ class SteamService(APIRetryMixin):
                             'translated_content': translated_content if translated_content else original_content,
                             'original_title': original_title,
                             'original_content': original_content,
+                            'original_hash': original_hash,
+                            # 预先完成展示所需的清理与格式化，渲染消息时直接使用
+                            'cleaned_title': clean_game_text(final_title),
+                            'cleaned_content': self._format_content_structure(self._smart_truncate_content(final_content)),
                             'translation_time': datetime.now().isoformat()
                         }
                         
+                        original_text = f"{original_title}\n{original_content}" if original_title and original_content else (original_title or original_content)
                         await translation_cache.store_translated_content(
                             'steam', item_id, original_text, translated_text, metadata
                         )
@@ -209,9 +339,6 @@ class SteamService(APIRetryMixin):
                             bot_logger.debug(f"Steam更新 #{item_id} 翻译失败，但原文已缓存")
                 else:
                     bot_logger.debug(f"Steam更新 #{item_id} 已有有效翻译缓存")
-                    
-                # 添加小延迟避免API调用过快
-                await asyncio.sleep(0.1)
                 
             except Exception as e:
                 bot_logger.error(f"翻译Steam更新 {update.get('id')} 时发生错误: {e}")
@@ -219,17 +346,32 @@ class SteamService(APIRetryMixin):
         
         return all_successful and processed_count > 0
     
+    async def _translate_field(self, text: str) -> str:
+        """
+        翻译单个字段，空字段直接返回空字符串
+        
+        Args:
+            text: 原文
+        
+        Returns:
+            译文
+        """
+        if not text:
+            return ""
+        return await self.translation_service.translate_text(text, "zh")
+    
     async def get_latest_steam_update(self) -> Optional[Dict[str, Any]]:
         """
-        获取最新的Steam更新数据，严格从缓存获取，确保遵循Redis优先原则。
+        获取最新的Steam更新数据，优先从缓存获取，确保遵循Redis优先原则。
+        缓存为空或无效时执行刷新（与轮转系统的刷新共享同一次执行）后读取刷新结果。
         """
         try:
             # 优先从统一缓存管理器获取数据
             cached_updates = await hd2_cache_service.get_steam_updates()
             
             if not cached_updates:
-                bot_logger.warning("Steam更新缓存为空，数据正在后台更新中...")
-                return None
+                bot_logger.warning("Steam更新缓存为空，立即刷新...")
+                return await self._refresh_and_get_latest()
             
             # 获取最新的一条更新
             latest_update = cached_updates[0]
@@ -253,13 +395,7 @@ class SteamService(APIRetryMixin):
             # 4. 如果缓存无效，则强制刷新；否则返回缓存
             if not is_valid:
                 bot_logger.warning(f"最新的缓存Steam更新 #{update_id} 无效（无内容），强制从API刷新。")
-                # 刷新缓存后重新尝试获取
-                await self.refresh_cache_if_needed()
-                # 重新获取刷新后的缓存数据
-                cached_updates = await hd2_cache_service.get_steam_updates()
-                if cached_updates:
-                    return cached_updates[0]
-                return None
+                return await self._refresh_and_get_latest()
             else:
                 bot_logger.debug(f"发现有效的缓存Steam更新 #{update_id}。")
                 return latest_update
@@ -268,6 +404,31 @@ class SteamService(APIRetryMixin):
             bot_logger.error(f"获取Steam更新数据时发生严重错误: {e}")
             return None
     
+    async def _refresh_and_get_latest(self) -> Optional[Dict[str, Any]]:
+        """
+        刷新缓存（与轮转系统的刷新共享同一次执行）后读取刷新写入的最新更新
+        
+        Returns:
+            最新的Steam更新数据（完整记录），刷新失败时返回 None
+        """
+        await self.refresh_cache_if_needed()
+        # 内容索引只保存ID等基本信息，仅用于确定最新更新的ID
+        cached_index = await translation_cache.get_content_list('steam')
+        if not cached_index:
+            return None
+        update_id = str(cached_index[0].get('id', ''))
+        
+        # 从本次获取的API数据或统一缓存中取出包含标题、内容等字段的完整记录
+        for update in self._last_updates or ():
+            if str(update.get('id', '')) == update_id:
+                return update
+        for update in await hd2_cache_service.get_steam_updates() or ():
+            if str(update.get('id', '')) == update_id:
+                return update
+        
+        bot_logger.warning(f"未找到Steam更新 #{update_id} 的完整数据，仅使用翻译缓存中的信息")
+        return cached_index[0]
+    
     async def format_steam_update_message(self, update: Dict[str, Any]) -> str:
         """
         格式化Steam更新数据为消息（使用缓存翻译）
@@ -304,12 +465,15 @@ class SteamService(APIRetryMixin):
             # 优先从完整的缓存细节中获取翻译和元数据
             translated_title = title
             translated_content = content
+            cleaned_title = cleaned_content = None
             
             if cached_translation.get('metadata'):
                 metadata = cached_translation['metadata']
                 # 如果有翻译则使用翻译，否则使用原文
                 translated_title = metadata.get('translated_title') or metadata.get('original_title') or title
                 translated_content = metadata.get('translated_content') or metadata.get('original_content') or content
+                cleaned_title = metadata.get('cleaned_title')
+                cleaned_content = metadata.get('cleaned_content')
                 
                 author = metadata.get('author') or author
                 published_time = self._format_time(metadata.get('publishedAt')) or published_time
@@ -318,26 +482,33 @@ class SteamService(APIRetryMixin):
             else:
                 bot_logger.warning(f"Steam 更新 #{update_id} 的缓存细节中缺少元数据，使用概览信息。")
 
-            # 清理游戏格式标签
-            translated_title = clean_game_text(translated_title)
-            
-            # 智能处理长内容（在清理之前进行，以保留格式信息）
-            translated_content = self._smart_truncate_content(translated_content)
+            # 翻译缓存中已有预先处理的结果时直接使用（旧缓存没有该字段或结果为空时，现场处理）
+            if cleaned_title:
+                translated_title = cleaned_title
+            else:
+                # 清理游戏格式标签
+                translated_title = clean_game_text(translated_title)
             
-            # 最后清理并格式化内容
-            translated_content = self._format_content_structure(translated_content)
+            if cleaned_content:
+                translated_content = cleaned_content
+            else:
+                # 智能处理长内容（在清理之前进行，以保留格式信息）
+                translated_content = self._smart_truncate_content(translated_content)
+                
+                # 最后清理并格式化内容
+                translated_content = self._format_content_structure(translated_content)
             
             # 构建消息
-            message = f"\n🎮 Steam 更新日志 | HELLDIVERS 2\n"
-            message += "-------------\n"
-            message += f"▎标题: {translated_title}\n"
-            message += f"▎作者: {author}\n"
-            message += f"▎时间: {published_time}\n"
-            message += "-------------\n"
-            message += f"▎内容:\n{translated_content}\n"
-            message += "-------------"
-            
-            return message
+            return (
+                "\n🎮 Steam 更新日志 | HELLDIVERS 2\n"
+                "-------------\n"
+                f"▎标题: {translated_title}\n"
+                f"▎作者: {author}\n"
+                f"▎时间: {published_time}\n"
+                "-------------\n"
+                f"▎内容:\n{translated_content}\n"
+                "-------------"
+            )
             
         except Exception as e:
             bot_logger.error(f"格式化Steam更新数据时发生错误: {e}")
@@ -543,16 +714,8 @@ class SteamService(APIRetryMixin):
         Returns:
             格式化后的时间字符串
         """
-        try:
-            # 解析ISO时间格式
-            dt = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
-            
-            # 转换为本地时间显示
-            local_dt = dt.replace(tzinfo=timezone.utc).astimezone()
-            
-            return local_dt.strftime("%Y-%m-%d %H:%M:%S")
-        except (ValueError, AttributeError):
-            return "未知时间"
+        # 与快讯共用按输入缓存的实现，本地时区在进程启动时确定一次
+        return _format_time_cached(time_str)
 
 
 # 创建全局Steam服务实例
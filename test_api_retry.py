@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+重试退避测试脚本
+验证无限重试时退避延迟始终不超过上限
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(__file__))
+
+from utils.api_retry import _compute_delay
+
+def test_exponential_delay_capped():
+    """尝试次数极大时指数退避不溢出，且不超过最大延迟"""
+    for attempt in (1, 10, 1025, 5000):
+        delay = _compute_delay(attempt, 1.0, 30.0, 1.0, True, 'exponential')
+        assert 0 < delay <= 30, f"attempt={attempt} delay={delay}"
+    assert _compute_delay(5000, 1.0, 30.0, 1.0, True, 'exponential') <= 30
+    print("✅ 指数退避延迟上限测试通过")
+
+if __name__ == "__main__":
+    test_exponential_delay_capped()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量翻译测试脚本
+验证编号分隔符的拆分，以及分隔符丢失或粘连时回退为逐条翻译
+"""
+import asyncio
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(__file__))
+
+from core.news import TranslationService
+
+TEXTS = ["Increase damage by 50%", "Reduce cooldown 30%", "Liberate the planet"]
+
+
+def make_service(batch_response):
+    """创建翻译服务，用假的翻译请求替代上游API，并记录调用情况"""
+    service = TranslationService()
+    calls = {"batch": [], "single": []}
+
+    async def fake_request_translation(stripped, to_lang):
+        calls["batch"].append(stripped)
+        return batch_response(stripped)
+
+    async def fake_translate_text(text, to_lang="zh-CN"):
+        calls["single"].append(text)
+        return f"译:{text}"
+
+    service._request_translation = fake_request_translation
+    service.translate_text = fake_translate_text
+    return service, calls
+
+
+def test_split_batch():
+    """按编号分隔符拆分，分隔符缺失或错序时返回 None"""
+    assert TranslationService._split_batch("提升50%⟦1⟧降低 30%", 2) == ["提升50%", "降低 30%"]
+    assert TranslationService._split_batch("a\n⟦1⟧\nb\n⟦2⟧\nc", 3) == ["a", "b", "c"]
+    assert TranslationService._split_batch("a b⟦2⟧c", 3) is None
+    assert TranslationService._split_batch("a⟦2⟧b⟦1⟧c", 3) is None
+    assert TranslationService._split_batch("提升50%降低 30%", 2) is None
+    print("✅ 分隔符拆分测试通过")
+
+
+async def check_batch_translation():
+    """正常情况下合并为一次请求，以%结尾的文本同样参与合并"""
+    service, calls = make_service(lambda joined: joined.replace("Increase", "提升").replace("Reduce", "降低"))
+    results = await service.translate_texts(TEXTS, "zh")
+    assert len(calls["batch"]) == 1 and not calls["single"]
+    assert results[0] == "提升 damage by 50%" and results[1] == "降低 cooldown 30%"
+    print("✅ 合并翻译测试通过")
+
+
+async def check_fallback_on_lost_marker():
+    """译文丢失分隔符（段落粘连）时回退为逐条翻译，不写入错位的译文"""
+    service, calls = make_service(lambda joined: joined.replace("\n⟦1⟧\n", "%"))
+    results = await service.translate_texts(TEXTS, "zh")
+    assert len(calls["batch"]) == 1
+    assert calls["single"] == TEXTS
+    assert results == [f"译:{text}" for text in TEXTS]
+    print("✅ 分隔符丢失回退测试通过")
+
+
+async def main():
+    test_split_batch()
+    await check_batch_translation()
+    await check_fallback_on_lost_marker()
+
+
+def test_translate_texts():
+    """供 pytest 收集的入口"""
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
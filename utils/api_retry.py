@@ -9,34 +9,86 @@ from typing import Optional, Callable, Any
 from utils.logger import bot_logger
 
 
+class APIStatusError(Exception):
+    """
+    API返回非200状态码
+
+    在重试函数中抛出此异常，由重试机制根据状态码决定是否重试
+    """
+
+    def __init__(self, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def _compute_delay(
+    attempt: int,
+    base_delay: float,
+    max_delay: float,
+    increment: float,
+    jitter: bool,
+    backoff: str
+) -> float:
+    """
+    计算第 attempt 次失败后的等待时间
+
+    Args:
+        attempt: 已尝试次数（从1开始）
+        base_delay: 基础延迟时间（秒）
+        max_delay: 最大延迟时间（秒）
+        increment: 线性策略下每次重试增加的延迟时间（秒）
+        jitter: 是否添加随机抖动
+        backoff: 退避策略，'linear' 或 'exponential'
+
+    Returns:
+        等待秒数
+    """
+    if backoff == "exponential":
+        # 指数退避，抖动系数偏置为 1 + random()，保证延迟单调增长
+        factor = (1 + random.random()) if jitter else 1.0
+        # 限制指数：无限重试时 attempt 持续增长，2**n 过大会在转换为浮点数时溢出
+        return min(max_delay, factor * (2 ** min(attempt - 1, 30)) * base_delay)
+
+    delay = min(base_delay + increment * (attempt - 1), max_delay)
+    if jitter:
+        delay += random.uniform(0, delay * 0.1)  # 添加10%的随机抖动
+    return delay
+
+
 async def exponential_backoff_retry(
     func: Callable,
     base_delay: float = 3.0,
     max_delay: float = 30.0,
     increment: float = 3.0,
     jitter: bool = True,
-    retry_on_status: Optional[list] = None
+    retry_on_status: Optional[list] = None,
+    backoff: str = "linear",
+    timeout_base_delay: Optional[float] = None
 ) -> Any:
     """
-    使用线性增量退避策略重试函数调用
+    使用退避策略重试函数调用（默认线性增量，可选指数退避）
 
     Args:
         func: 要重试的异步函数
         base_delay: 基础延迟时间（秒）
         max_delay: 最大延迟时间（秒）
-        increment: 每次重试增加的延迟时间（秒）
+        increment: 每次重试增加的延迟时间（秒），仅用于线性策略
         jitter: 是否添加随机抖动
         retry_on_status: 需要重试的HTTP状态码列表，None表示重试所有非200状态码
+        backoff: 退避策略，'linear'（默认）或 'exponential'
+        timeout_base_delay: 请求超时时使用的基础延迟，None表示与 base_delay 相同
 
     Returns:
         函数调用结果，或在持续失败后返回None
     """
     if retry_on_status is None:
         retry_on_status = [429, 500, 502, 503, 504]  # 默认重试的状态码
+    if timeout_base_delay is None:
+        timeout_base_delay = base_delay
 
     last_exception = None
     attempt = 0
-    current_delay = base_delay
 
     while True:  # 无限重试
         attempt += 1
@@ -48,16 +100,17 @@ async def exponential_backoff_retry(
                 if result.status == 200:
                     return result
                 elif result.status in retry_on_status:
-                    delay = current_delay
-                    if jitter:
-                        delay += random.uniform(0, delay * 0.1)  # 添加10%的随机抖动
+                    delay = _compute_delay(attempt, base_delay, max_delay, increment, jitter, backoff)
+                    # 服务端指定了 Retry-After 时优先遵循
+                    retry_after = getattr(result, 'retry_after', None)
+                    if retry_after is not None:
+                        delay = min(retry_after, max_delay)
 
                     bot_logger.warning(
                         f"API请求失败 (第{attempt}次尝试): 状态码 {result.status}，"
                         f"{delay:.1f}秒后重试..."
                     )
                     await asyncio.sleep(delay)
-                    current_delay = min(current_delay + increment, max_delay)
                     continue
                 else:
                     # 不需要重试的状态码
@@ -67,36 +120,69 @@ async def exponential_backoff_retry(
                 # 非HTTP响应对象，直接返回
                 return result
 
+        except APIStatusError as e:
+            if e.status not in retry_on_status:
+                bot_logger.error(f"API请求失败: 状态码 {e.status} (不重试)")
+                return None
+
+            last_exception = e
+            delay = _compute_delay(attempt, base_delay, max_delay, increment, jitter, backoff)
+            # 服务端指定了 Retry-After 时优先遵循
+            if e.retry_after is not None:
+                delay = min(e.retry_after, max_delay)
+
+            bot_logger.warning(
+                f"API请求失败 (第{attempt}次尝试): 状态码 {e.status}，"
+                f"{delay:.1f}秒后重试..."
+            )
+            await asyncio.sleep(delay)
+            continue
+
         except asyncio.TimeoutError as e:
             last_exception = e
-            delay = current_delay
-            if jitter:
-                delay += random.uniform(0, delay * 0.1)
+            delay = _compute_delay(attempt, timeout_base_delay, max_delay, increment, jitter, backoff)
 
             bot_logger.warning(f"API请求超时 (第{attempt}次尝试)，{delay:.1f}秒后重试...")
             await asyncio.sleep(delay)
-            current_delay = min(current_delay + increment, max_delay)
             continue
 
         except Exception as e:
             last_exception = e
-            delay = current_delay
-            if jitter:
-                delay += random.uniform(0, delay * 0.1)
+            delay = _compute_delay(attempt, base_delay, max_delay, increment, jitter, backoff)
 
             bot_logger.warning(f"API请求异常 (第{attempt}次尝试): {e}，{delay:.1f}秒后重试...")
             await asyncio.sleep(delay)
-            current_delay = min(current_delay + increment, max_delay)
             continue
 
     return None # 理论上不会到达
 
 
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    解析 Retry-After 响应头（仅支持秒数格式）
+
+    Args:
+        value: Retry-After 头的原始值
+
+    Returns:
+        等待秒数，无法解析时返回None
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        return None
+    return seconds if seconds >= 0 else None
+
+
 class APIRetryMixin:
     """
     API重试混入类
     为服务类提供统一的重试机制
     """
+    # 声明混入类自身的属性，使定义了 __slots__ 的子类实例不再带有 __dict__
+    __slots__ = ('default_retry_config',)
 
     def __init__(self):
         self.default_retry_config = {
@@ -104,7 +190,9 @@ class APIRetryMixin:
             'max_delay': 30.0,
             'increment': 3.0,
             'jitter': True,
-            'retry_on_status': [429, 500, 502, 503, 504]
+            'retry_on_status': [429, 500, 502, 503, 504],
+            'backoff': 'linear',
+            'timeout_base_delay': None
         }
 
     async def retry_api_call(self, func: Callable, **retry_kwargs) -> Any:
@@ -4,7 +4,7 @@
 支持定时更新、快速查询和数据一致性
 """
 import asyncio
-import json
+import orjson as json
 import time
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, Callable, List
@@ -143,14 +143,14 @@ class APICacheManager:
                 if config.expiry > 0:
                     await redis_manager.set(
                         config.key, 
-                        json.dumps(cache_data, ensure_ascii=False),
+                        json.dumps(cache_data),
                         expire=config.expiry
                     )
                 else:
                     # 不设置过期时间，直接覆盖
                     await redis_manager.set(
                         config.key, 
-                        json.dumps(cache_data, ensure_ascii=False)
+                        json.dumps(cache_data)
                     )
                 
                 elapsed = time.time() - start_time
@@ -140,6 +140,10 @@ class CacheRotationIntegration:
             async def steam_refresh_handler():
                 """Steam更新缓存刷新处理器"""
                 try:
+                    if not steam_service.should_poll_now():
+                        bot_logger.debug("⏳ Steam更新API获取失败退避中，跳过本次刷新检查")
+                        return
+                    
                     bot_logger.debug("🔄 执行Steam更新缓存刷新检查...")
                     refreshed = await steam_service.refresh_cache_if_needed()
                     
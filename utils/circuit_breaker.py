@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+熔断器
+连续失败达到阈值后在冷却期内直接拒绝请求，避免上游故障时反复重试
+"""
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    熔断器（CLOSED → OPEN → HALF_OPEN）
+
+    - CLOSED: 正常放行，连续失败达到 fail_threshold 次后进入 OPEN
+    - OPEN: 冷却期 reset_timeout 秒内拒绝所有请求
+    - HALF_OPEN: 冷却期结束后放行试探请求，成功则恢复 CLOSED，失败则重新进入 OPEN
+    """
+    fail_threshold: int = 5
+    reset_timeout: float = 60.0
+    failures: int = 0
+    opened_at: float = 0.0
+
+    def is_open(self) -> bool:
+        """是否处于熔断冷却期"""
+        return self.failures >= self.fail_threshold and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def record_success(self) -> None:
+        """记录一次成功请求，恢复正常状态"""
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        """记录一次失败请求，达到阈值（或试探失败）时重新开始冷却计时"""
+        self.failures += 1
+        if self.failures >= self.fail_threshold:
+            self.opened_at = time.monotonic()
@@ -101,8 +101,8 @@ class Settings:
     # 翻译服务配置
     TRANSLATION_API_URL = _config.get("translation", {}).get("api_url", "https://uapis.cn/api/v1/ai/translate")
     TRANSLATION_TIMEOUT = _config.get("translation", {}).get("timeout", 20)
-    TRANSLATION_RETRY_BASE_DELAY = _config.get("translation", {}).get("retry", {}).get("base_delay", 5.0)
-    TRANSLATION_RETRY_MAX_DELAY = _config.get("translation", {}).get("retry", {}).get("max_delay", 60.0)
+    TRANSLATION_RETRY_BASE_DELAY = _config.get("translation", {}).get("retry", {}).get("base_delay", 0.5)
+    TRANSLATION_RETRY_MAX_DELAY = _config.get("translation", {}).get("retry", {}).get("max_delay", 30.0)
     TRANSLATION_RETRY_INCREMENT = _config.get("translation", {}).get("retry", {}).get("increment", 3.0)
     
     # Steam 内容处理配置
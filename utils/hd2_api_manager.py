@@ -15,8 +15,9 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from utils.logger import bot_logger
-from utils.api_retry import APIRetryMixin
+from utils.api_retry import APIRetryMixin, APIStatusError
 from utils.config import settings
+from utils.http_client import get_http_session
 
 class HD2ApiManager(APIRetryMixin):
     """Helldivers 2 API 管理器"""
@@ -47,37 +48,25 @@ class HD2ApiManager(APIRetryMixin):
         url = f"{self.base_url}{endpoint}"
         
         async def _api_call():
-            async with aiohttp.ClientSession(
-                headers=self.default_headers,
-                timeout=self.timeout
-            ) as session:
-                bot_logger.debug(f"发送 API 请求: {url}")
-                
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        bot_logger.debug(f"API 请求成功: {url}")
-                        return data
-                    else:
-                        # 返回带状态码的响应对象，让重试机制处理
-                        class APIResponse:
-                            def __init__(self, status):
-                                self.status = status
-                        return APIResponse(response.status)
+            session = await get_http_session()
+            bot_logger.debug(f"发送 API 请求: {url}")
+            
+            async with session.get(url, params=params, headers=self.default_headers, timeout=self.timeout) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    bot_logger.debug(f"API 请求成功: {url}")
+                    return data
+                else:
+                    # 抛出带状态码的异常，让重试机制处理
+                    raise APIStatusError(response.status)
         
         # 使用重试机制调用API，使用配置的重试参数
-        result = await self.retry_api_call(
+        return await self.retry_api_call(
             _api_call,
             base_delay=settings.HD2_API_RETRY_BASE_DELAY,
             max_delay=settings.HD2_API_RETRY_MAX_DELAY,
             increment=settings.HD2_API_RETRY_INCREMENT
         )
-        
-        # 如果结果是APIResponse对象，说明请求失败
-        if hasattr(result, 'status'):
-            return None
-            
-        return result
 
 # 全局 API 管理器实例
 hd2_api = HD2ApiManager()
@@ -6,6 +6,7 @@ Helldivers 2 API缓存服务
 from typing import Dict, Any, Optional, List
 from utils.cache_manager import api_cache_manager, CacheConfig
 from utils.hd2_api_manager import hd2_api
+from utils.http_client import get_http_session
 from utils.logger import bot_logger
 from utils.config import Settings
 
@@ -121,24 +122,23 @@ class HD2CacheService:
         """获取Steam更新数据"""
         try:
             endpoint = "https://api.helldivers2.dev/api/v1/steam"
-            import aiohttp
             headers = {
                 'X-Super-Client': 'hd2_qqbot',
                 'X-Super-Contact': 'xiaoyueyoqwq@vaiiya.org',
                 'User-Agent': 'Helldivers2-QQBot/1.0'
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(endpoint, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        bot_logger.debug(f"成功获取Steam更新数据，共 {len(data)} 条")
-                        # 按发布时间排序，最新的在前
-                        sorted_data = sorted(data, key=lambda x: x.get('publishedAt', ''), reverse=True)
-                        return sorted_data
-                    else:
-                        bot_logger.warning(f"Steam API请求失败，状态码: {response.status}")
-                        return None
+            session = await get_http_session()
+            async with session.get(endpoint, headers=headers) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    bot_logger.debug(f"成功获取Steam更新数据，共 {len(data)} 条")
+                    # 按发布时间排序，最新的在前
+                    sorted_data = sorted(data, key=lambda x: x.get('publishedAt', ''), reverse=True)
+                    return sorted_data
+                else:
+                    bot_logger.warning(f"Steam API请求失败，状态码: {response.status}")
+                    return None
                         
         except Exception as e:
             bot_logger.error(f"获取Steam更新数据时发生错误: {e}")
@@ -148,24 +148,23 @@ class HD2CacheService:
         """获取快讯数据"""
         try:
             endpoint = "https://api.helldivers2.dev/api/v1/dispatches"
-            import aiohttp
             headers = {
                 'X-Super-Client': 'hd2_qqbot',
                 'X-Super-Contact': 'xiaoyueyoqwq@vaiiya.org',
                 'User-Agent': 'Helldivers2-QQBot/1.0'
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(endpoint, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        bot_logger.debug(f"成功获取快讯数据，共 {len(data)} 条")
-                        # 按发布时间排序，最新的在前
-                        sorted_data = sorted(data, key=lambda x: x.get('published', ''), reverse=True)
-                        return sorted_data
-                    else:
-                        bot_logger.warning(f"快讯API请求失败，状态码: {response.status}")
-                        return None
+            session = await get_http_session()
+            async with session.get(endpoint, headers=headers) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    bot_logger.debug(f"成功获取快讯数据，共 {len(data)} 条")
+                    # 按发布时间排序，最新的在前
+                    sorted_data = sorted(data, key=lambda x: x.get('published', ''), reverse=True)
+                    return sorted_data
+                else:
+                    bot_logger.warning(f"快讯API请求失败，状态码: {response.status}")
+                    return None
                         
         except Exception as e:
             bot_logger.error(f"获取快讯数据时发生错误: {e}")
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+共享HTTP客户端
+全局复用同一个 aiohttp.ClientSession，保持各主机的长连接；
+翻译请求使用支持HTTP/2多路复用的 httpx.AsyncClient
+"""
+import asyncio
+import importlib.util
+from typing import Optional
+
+import aiohttp
+import httpx
+
+from utils.logger import bot_logger
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_lock = asyncio.Lock()
+
+_translation_client: Optional[httpx.AsyncClient] = None
+_translation_client_lock = asyncio.Lock()
+# HTTP/2 需要可选依赖 h2，未安装时回退到 HTTP/1.1
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """
+    获取全局共享的HTTP会话（惰性创建）
+
+    超时和请求头应在每次请求时单独传入，而不是绑定在会话上。
+
+    Returns:
+        共享的 aiohttp.ClientSession 实例
+    """
+    global _session
+    if _session is not None and not _session.closed:
+        return _session
+
+    async with _session_lock:
+        if _session is None or _session.closed:
+            _session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=64,
+                    limit_per_host=16,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75,
+                    enable_cleanup_closed=True
+                ),
+                # 调用的均为无状态API，不需要保存Cookie
+                cookie_jar=aiohttp.DummyCookieJar()
+            )
+            bot_logger.debug("已创建共享HTTP会话")
+    return _session
+
+
+async def get_translation_client() -> httpx.AsyncClient:
+    """
+    获取翻译API专用的共享客户端（惰性创建）
+
+    启用HTTP/2时，并发的翻译请求复用同一条连接多路传输。
+
+    Returns:
+        共享的 httpx.AsyncClient 实例
+    """
+    global _translation_client
+    if _translation_client is not None and not _translation_client.is_closed:
+        return _translation_client
+
+    async with _translation_client_lock:
+        if _translation_client is None or _translation_client.is_closed:
+            _translation_client = httpx.AsyncClient(
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=75
+                ),
+                # 与 aiohttp 会话保持一致，不读取环境变量中的代理配置
+                trust_env=False
+            )
+            bot_logger.debug(f"已创建翻译客户端 (HTTP/2: {'启用' if _HTTP2_AVAILABLE else '未启用'})")
+    return _translation_client
+
+
+async def close_http_session() -> None:
+    """关闭全局共享的HTTP会话和翻译客户端"""
+    global _session, _translation_client
+    if _session is not None and not _session.closed:
+        await _session.close()
+        bot_logger.debug("共享HTTP会话已关闭")
+    _session = None
+
+    if _translation_client is not None and not _translation_client.is_closed:
+        await _translation_client.aclose()
+        bot_logger.debug("翻译客户端已关闭")
+    _translation_client = None
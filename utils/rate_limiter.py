@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+异步令牌桶限速器
+替代固定间隔的 asyncio.sleep 节流，允许突发并保持稳定速率
+"""
+import asyncio
+import time
+
+
+class AsyncLimiter:
+    """
+    令牌桶限速器
+
+    在 time_period 秒内最多放行 max_rate 次请求，可作为异步上下文管理器使用：
+
+        async with limiter:
+            await do_request()
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 60.0):
+        """
+        Args:
+            max_rate: 桶容量（时间窗口内允许的最大请求数）
+            time_period: 时间窗口长度（秒）
+        """
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._rate_per_sec = max_rate / time_period
+        self._level = 0.0
+        self._last_check = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _leak(self) -> None:
+        """按流逝时间释放已占用的容量"""
+        now = time.monotonic()
+        elapsed = now - self._last_check
+        self._last_check = now
+        self._level = max(0.0, self._level - elapsed * self._rate_per_sec)
+
+    def has_capacity(self, amount: float = 1) -> bool:
+        """检查当前是否可以立即放行"""
+        self._leak()
+        return self._level + amount <= self.max_rate
+
+    async def acquire(self, amount: float = 1) -> None:
+        """
+        获取令牌，容量不足时等待
+
+        Args:
+            amount: 需要的令牌数量
+        """
+        async with self._lock:
+            while not self.has_capacity(amount):
+                await asyncio.sleep((self._level + amount - self.max_rate) / self._rate_per_sec)
+            self._level += amount
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return None
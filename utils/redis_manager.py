@@ -64,6 +64,25 @@ class RedisManager:
         client = self._get_client()
         return await client.get(key)
 
+    async def mget(self, *keys: str) -> List[Optional[Any]]:
+        """一次往返获取多个键的值，顺序与传入的键一致"""
+        client = self._get_client()
+        if not keys:
+            return []
+        return await client.mget(*keys)
+
+    async def mset(self, mapping: Dict[str, Any], expire: Optional[int] = None):
+        """通过非事务管道一次往返设置多个键值对，均使用相同的过期时间"""
+        if not mapping:
+            return
+        client = self._get_client()
+        pipeline = client.pipeline(transaction=False)
+        for key, value in mapping.items():
+            if isinstance(value, (dict, list)):
+                value = json.dumps(value)
+            pipeline.set(key, value, ex=expire)
+        await pipeline.execute()
+
     async def delete(self, *keys: str) -> int:
         """删除一个或多个键"""
         client = self._get_client()
@@ -4,7 +4,9 @@
 自动获取、翻译、缓存和刷新游戏内容
 """
 import asyncio
+import time
 import orjson as json
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from utils.redis_manager import redis_manager
@@ -24,6 +26,30 @@ class TranslationCache:
         }
         self.last_refresh = {}
         
+        # 进程内LRU：缓存键 -> (写入时间, 序列化的JSON数据)，减少渲染时重复的Redis往返
+        self.local_ttl = 60
+        self.local_maxsize = 256
+        self._local: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        
+    def _local_get(self, cache_key: str) -> Optional[Any]:
+        """读取进程内LRU，过期条目视为未命中"""
+        entry = self._local.get(cache_key)
+        if entry is None:
+            return None
+        stored_at, data = entry
+        if time.monotonic() - stored_at > self.local_ttl:
+            del self._local[cache_key]
+            return None
+        self._local.move_to_end(cache_key)
+        return data
+    
+    def _local_put(self, cache_key: str, data: Any) -> None:
+        """写入进程内LRU，超出容量时淘汰最久未使用的条目"""
+        self._local[cache_key] = (time.monotonic(), data)
+        self._local.move_to_end(cache_key)
+        while len(self._local) > self.local_maxsize:
+            self._local.popitem(last=False)
+    
     async def get_cache_key(self, content_type: str, item_id: str = None) -> str:
         """生成缓存键"""
         if item_id:
@@ -58,12 +84,48 @@ class TranslationCache:
             # 序列化并存储
             serialized_data = json.dumps(cache_data)
             await redis_manager.set(cache_key, serialized_data, expire=self.default_ttl)
+            self._local_put(cache_key, serialized_data)
             
             bot_logger.debug(f"已缓存翻译内容: {content_type}:{item_id}")
             
         except Exception as e:
             bot_logger.error(f"存储翻译缓存失败: {e}")
     
+    async def store_translated_contents(self, content_type: str,
+                                        items: List[Tuple[str, str, str, Dict]]) -> None:
+        """
+        批量存储翻译后的内容（一次Redis往返）
+        
+        Args:
+            content_type: 内容类型 (dispatches/orders)
+            items: (项目ID, 原文, 译文, 元数据) 列表
+        """
+        if not items:
+            return
+        
+        try:
+            created_at = datetime.now().isoformat()
+            serialized = {}
+            for item_id, original_text, translated_text, metadata in items:
+                cache_key = await self.get_cache_key(content_type, item_id)
+                serialized[cache_key] = json.dumps({
+                    'original_text': original_text,
+                    'translated_text': translated_text,
+                    'metadata': metadata or {},
+                    'created_at': created_at,
+                    'content_type': content_type,
+                    'item_id': item_id
+                })
+            
+            await redis_manager.mset(serialized, expire=self.default_ttl)
+            for cache_key, serialized_data in serialized.items():
+                self._local_put(cache_key, serialized_data)
+            
+            bot_logger.debug(f"已批量缓存 {len(items)} 条翻译内容: {content_type}")
+            
+        except Exception as e:
+            bot_logger.error(f"批量存储翻译缓存失败: {e}")
+    
     async def get_translated_content(self, content_type: str, item_id: str) -> Optional[Dict]:
         """
         获取翻译后的内容
@@ -77,12 +139,15 @@ class TranslationCache:
         """
         try:
             cache_key = await self.get_cache_key(content_type, item_id)
+            local_data = self._local_get(cache_key)
+            if local_data is not None:
+                return json.loads(local_data)
+            
             cached_data = await redis_manager.get(cache_key)
             
             if cached_data:
-                if isinstance(cached_data, bytes):
-                    cached_data = cached_data.decode('utf-8')
-                
+                # 只缓存命中结果，未命中时下次仍会查询Redis
+                self._local_put(cache_key, cached_data)
                 return json.loads(cached_data)
             
             return None
@@ -91,6 +156,42 @@ class TranslationCache:
             bot_logger.error(f"获取翻译缓存失败: {e}")
             return None
     
+    async def get_translated_contents(self, content_type: str, item_ids: List[str]) -> List[Optional[Dict]]:
+        """
+        批量获取翻译后的内容（进程内LRU未命中的部分通过一次MGET读取）
+        
+        Args:
+            content_type: 内容类型
+            item_ids: 项目ID列表
+            
+        Returns:
+            与 item_ids 一一对应的缓存翻译数据，未命中的位置为None
+        """
+        results: List[Optional[Dict]] = [None] * len(item_ids)
+        try:
+            cache_keys = [await self.get_cache_key(content_type, item_id) for item_id in item_ids]
+            
+            missing = []
+            for index, cache_key in enumerate(cache_keys):
+                local_data = self._local_get(cache_key)
+                if local_data is not None:
+                    results[index] = json.loads(local_data)
+                else:
+                    missing.append(index)
+            
+            if missing:
+                values = await redis_manager.mget(*[cache_keys[index] for index in missing])
+                for index, cached_data in zip(missing, values):
+                    if cached_data:
+                        self._local_put(cache_keys[index], cached_data)
+                        results[index] = json.loads(cached_data)
+            
+            return results
+            
+        except Exception as e:
+            bot_logger.error(f"批量获取翻译缓存失败: {e}")
+            return results
+    
     async def store_content_list(self, content_type: str, items: List[Dict]) -> None:
         """
         存储内容列表的索引
@@ -137,9 +238,6 @@ class TranslationCache:
             cached_data = await redis_manager.get(index_key)
             
             if cached_data:
-                if isinstance(cached_data, bytes):
-                    cached_data = cached_data.decode('utf-8')
-                
                 return json.loads(cached_data)
             
             return []
@@ -148,6 +246,38 @@ class TranslationCache:
             bot_logger.error(f"获取内容索引失败: {e}")
             return []
     
+    async def get_content_fingerprint(self, content_type: str) -> Optional[str]:
+        """
+        获取上次刷新时记录的内容指纹
+        
+        Args:
+            content_type: 内容类型
+            
+        Returns:
+            内容指纹，不存在时返回None
+        """
+        try:
+            fingerprint_key = await self.get_cache_key(f"{content_type}_fingerprint")
+            return await redis_manager.get(fingerprint_key)
+        except Exception as e:
+            bot_logger.error(f"获取内容指纹失败: {e}")
+            return None
+    
+    async def store_content_fingerprint(self, content_type: str, fingerprint: str) -> None:
+        """
+        记录本次刷新的内容指纹
+        
+        Args:
+            content_type: 内容类型
+            fingerprint: 内容指纹
+        """
+        try:
+            fingerprint_key = await self.get_cache_key(f"{content_type}_fingerprint")
+            # 与翻译缓存同时过期，过期后下次刷新会重新检查并补齐翻译
+            await redis_manager.set(fingerprint_key, fingerprint, expire=self.default_ttl)
+        except Exception as e:
+            bot_logger.error(f"存储内容指纹失败: {e}")
+    
     async def check_content_freshness(self, content_type: str, new_items: List[Dict]) -> bool:
         """
         检查内容是否需要刷新
@@ -224,6 +354,8 @@ class TranslationCache:
             # 删除过期的缓存
             if outdated_keys:
                 await redis_manager._get_client().delete(*outdated_keys)
+                for key in outdated_keys:
+                    self._local.pop(key, None)
                 bot_logger.info(f"已清理 {len(outdated_keys)} 个过期的 {content_type} 缓存项")
             
         except Exception as e:
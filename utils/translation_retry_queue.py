@@ -183,8 +183,7 @@ class TranslationRetryQueue:
         """
         # 导入翻译服务（避免循环导入）
         try:
-            from core.news import TranslationService
-            translation_service = TranslationService()
+            from core.news import translation_service
         except ImportError:
             bot_logger.error("无法导入翻译服务，跳过重试任务处理")
             return